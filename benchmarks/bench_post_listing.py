@@ -0,0 +1,137 @@
+"""CPU cost per listed post: ORM hydration vs. the projection read path.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_post_listing [posts] [repeats]
+
+The "orm" path rebuilds the object graph the old get_posts loaded (Post,
+User, PostTag -> Tag and every PostRating) and turns it into PostResponse
+with model_validate plus the per-post rating/tag rewrite. The "rows" path
+builds the flat rows the projection query returns and maps them with
+PostRepository._row_to_response. Database time is excluded from both, so the
+ORM figure understates the real gap: it leaves out result-set hydration of
+the extra tag and rating rows.
+"""
+import sys
+import time
+from collections import namedtuple
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+from src.entity.models import Post, PostRating, PostTag, Tag, User
+from src.repositories.post_repository import PostRepository
+from src.schemas.post import PostResponse, TagsShortResponse
+
+TAGS_PER_POST = 3
+RATINGS_PER_POST = 20
+
+ListingRow = namedtuple(
+    "ListingRow",
+    "id title user_id description image_url location created_at updated_at "
+    "avg_rating rating_count user_name user_img_link tag_names",
+)
+
+
+def _seed(count):
+    now = datetime(2025, 4, 1)
+    authors = [User(id=uuid4(), name=f"author {i}", img_link=None) for i in range(50)]
+    tags = [Tag(name=f"tag{i}") for i in range(200)]
+    seeds = []
+    for i in range(count):
+        author = authors[i % len(authors)]
+        seeds.append(
+            dict(
+                id=uuid4(),
+                user=author,
+                title=f"Post {i}",
+                description="Lorem ipsum dolor sit amet " * 4,
+                image_url=f"https://res.cloudinary.com/demo/{i}.jpg",
+                location="Kyiv",
+                created_at=now - timedelta(minutes=i),
+                tags=[tags[(i + k) % len(tags)] for k in range(TAGS_PER_POST)],
+                ratings=[1 + (i + k) % 5 for k in range(RATINGS_PER_POST)],
+            )
+        )
+    return seeds
+
+
+def orm_path(seeds):
+    responses = []
+    for seed in seeds:
+        post = Post(
+            id=seed["id"],
+            user_id=seed["user"].id,
+            user=seed["user"],
+            title=seed["title"],
+            description=seed["description"],
+            image_url=seed["image_url"],
+            location=seed["location"],
+            created_at=seed["created_at"],
+            updated_at=seed["created_at"],
+            tags=[PostTag(id=uuid4(), tag_name=tag.name, tag=tag) for tag in seed["tags"]],
+            ratings=[PostRating(id=uuid4(), rating=r) for r in seed["ratings"]],
+        )
+        response = PostResponse.model_validate(post)
+        response.avg_rating = (
+            round(sum(r.rating for r in post.ratings) / len(post.ratings), 2)
+            if post.ratings else None
+        )
+        response.rating_count = len(post.ratings)
+        response.tags = [
+            TagsShortResponse.model_validate(tag_rel.tag)
+            for tag_rel in post.tags
+            if tag_rel.tag is not None
+        ]
+        responses.append(response)
+    return responses
+
+
+def rows_path(seeds):
+    responses = []
+    for seed in seeds:
+        ratings = seed["ratings"]
+        row = ListingRow(
+            seed["id"],
+            seed["title"],
+            seed["user"].id,
+            seed["description"],
+            seed["image_url"],
+            seed["location"],
+            seed["created_at"],
+            seed["created_at"],
+            sum(ratings) / len(ratings),
+            len(ratings),
+            seed["user"].name,
+            seed["user"].img_link,
+            [tag.name for tag in seed["tags"]],
+        )
+        responses.append(PostRepository._row_to_response(row))
+    return responses
+
+
+def _best_of(fn, seeds, repeats):
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.process_time()
+        fn(seeds)
+        best = min(best, time.process_time() - started)
+    return best
+
+
+def main(count=2000, repeats=5):
+    seeds = _seed(count)
+
+    # Both paths must render the same payload before their cost is compared.
+    assert orm_path(seeds[:10]) == rows_path(seeds[:10])
+
+    orm_time = _best_of(orm_path, seeds, repeats)
+    rows_time = _best_of(rows_path, seeds, repeats)
+
+    print(f"posts listed:        {count}")
+    print(f"orm hydration path:  {orm_time / count * 1e6:8.1f} us/post")
+    print(f"projection row path: {rows_time / count * 1e6:8.1f} us/post")
+    print(f"speedup:             {orm_time / rows_time:8.1f}x")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
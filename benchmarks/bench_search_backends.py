@@ -0,0 +1,130 @@
+"""Keyword search through both backends: Postgres full-text vs. in-process BM25.
+
+Run from the repository root against a migrated development database
+(DB_URL from the usual settings):
+
+    python -m benchmarks.bench_search_backends [posts] [repeats]
+
+Everything happens in one transaction that is rolled back at the end: the
+script seeds ``posts`` synthetic posts with Zipf-distributed words, runs
+ANALYZE, loads MemorySearchBackend from the posts table the way the app does
+at startup, then times ``search_posts`` (the backend's match plus the page
+statement, and the count when there is a second page) for each query with
+PostgresSearchBackend and with MemorySearchBackend. Each query is run sorted
+by relevance and by date; the memory backend's per-query memo is cleared
+before every run so the ranking is paid each time. Nothing is left behind in
+the database.
+"""
+import asyncio
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+from sqlalchemy import insert, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from src.conf.config import settings
+from src.entity.models import Post, User, UserTypeEnum
+from src.repositories import search_filter
+from src.repositories.post_repository import PostRepository
+from src.repositories.search_filter import search_posts
+from src.schemas.search_filter import PostSearchRequest
+from src.services.search_backend import MemorySearchBackend, PostgresSearchBackend
+
+VOCABULARY_SIZE = 5000
+QUERIES = ("word4321", "word342, word4012", "word17", "word2", "word4999 word3")
+SORTS = ("relevance", "date")
+BATCH_SIZE = 5000
+
+
+def _post_rows(count, user_id):
+    rng = random.Random(42)
+    words = [f"word{i}" for i in range(VOCABULARY_SIZE)]
+    # Zipf-like: a few very common words, a long tail of rare ones.
+    weights = [1 / (rank + 1) for rank in range(VOCABULARY_SIZE)]
+    started = datetime(2025, 1, 1)
+    return [
+        {
+            "id": uuid4(),
+            "user_id": user_id,
+            "title": " ".join(rng.choices(words, weights, k=5)),
+            "description": " ".join(rng.choices(words, weights, k=30)),
+            "image_url": "https://example.com/bench.jpg",
+            "created_at": started + timedelta(seconds=i),
+            "updated_at": started + timedelta(seconds=i),
+            "tag_names": " ".join(rng.choices(words, weights, k=3)),
+        }
+        for i in range(count)
+    ]
+
+
+async def _seed(db, count):
+    user_id = uuid4()
+    await db.execute(insert(User).values(
+        id=user_id, username=f"bench_{user_id.hex}", email=f"{user_id.hex}@example.com",
+        type=UserTypeEnum.user, password="x", is_active=True,
+        created_at=datetime.utcnow(), updated_at=datetime.utcnow(),
+    ))
+    rows = _post_rows(count, user_id)
+    for start in range(0, count, BATCH_SIZE):
+        await db.execute(insert(Post), rows[start:start + BATCH_SIZE])
+    await db.execute(text("ANALYZE posts"))
+
+
+async def _best_of(fn, repeats):
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.perf_counter()
+        await fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+async def main(count=100_000, repeats=5):
+    postgres = PostgresSearchBackend()
+    memory = MemorySearchBackend(max_hits=settings.SEARCH_MEMORY_MAX_HITS)
+    engine = create_async_engine(settings.DB_URL)
+
+    async with engine.connect() as conn:
+        transaction = await conn.begin()
+        try:
+            db = AsyncSession(bind=conn)
+            await _seed(db, count)
+
+            started = time.perf_counter()
+            memory.load(await PostRepository(db).get_search_documents())
+            print(f"posts seeded:   {count}")
+            print(f"memory load:    {time.perf_counter() - started:8.2f} s")
+            print()
+            print(f"{'query':<20} {'sort':<10} {'total':>8} {'postgres':>11} {'memory':>11}")
+
+            for keyword in QUERIES:
+                for sort_by in SORTS:
+                    filters = PostSearchRequest(keyword=keyword, sort_by=sort_by)
+
+                    async def run_postgres():
+                        search_filter.search_backend = postgres
+                        return await search_posts(filters, db)
+
+                    async def run_memory():
+                        # match() memoises per query; clear it so every run ranks again.
+                        search_filter.search_backend = memory
+                        memory._memo.clear()
+                        return await search_posts(filters, db)
+
+                    postgres_time = await _best_of(run_postgres, repeats)
+                    memory_time = await _best_of(run_memory, repeats)
+                    total = (await run_postgres()).total
+                    print(
+                        f"{keyword:<20} {sort_by:<10} {total:>8} "
+                        f"{postgres_time * 1e3:8.2f} ms {memory_time * 1e3:8.2f} ms"
+                    )
+        finally:
+            await transaction.rollback()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(*(int(arg) for arg in sys.argv[1:3])))
@@ -0,0 +1,115 @@
+"""Plans of the '%fragment%' searches with and without the trigram indexes.
+
+Run from the repository root against a migrated development database
+(DB_URL from the usual settings):
+
+    python -m benchmarks.bench_trigram_search [rows]
+
+Everything happens in one transaction that is rolled back at the end: the
+script seeds ``rows`` synthetic users, posts and tags, runs ANALYZE, then
+EXPLAIN ANALYZEs each substring query twice. The first pass uses the trigram
+indexes; the second drops them inside the transaction and shows the
+sequential scans they replace. Nothing is left behind in the database.
+"""
+import asyncio
+import json
+import sys
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.conf.config import settings
+
+SEED = """
+INSERT INTO users (id, username, name, email, type, password, is_active, created_at, updated_at)
+SELECT gen_random_uuid(), 'bench_user_' || i, 'Bench Author ' || i,
+       'bench.author' || i || '@example.com', 'user', 'x', true, now(), now()
+FROM generate_series(1, :rows) AS i;
+
+INSERT INTO tags (name)
+SELECT 'benchtag' || i FROM generate_series(1, :rows) AS i;
+
+INSERT INTO posts (id, user_id, title, description, image_url, created_at, updated_at)
+SELECT gen_random_uuid(), u.id, 'Bench post ' || md5(u.username),
+       'Generated description ' || md5(u.email) || ' for the trigram benchmark',
+       'https://example.com/' || u.username || '.jpg', now(), now()
+FROM users AS u
+WHERE u.username LIKE 'bench_user_%';
+"""
+
+QUERIES = {
+    "posts.title": "SELECT id FROM posts WHERE title ILIKE '%' || :fragment || '%'",
+    "posts.description": "SELECT id FROM posts WHERE description ILIKE '%' || :fragment || '%'",
+    "tags.name": "SELECT name FROM tags WHERE name ILIKE '%' || :fragment || '%'",
+    "users.name": "SELECT id FROM users WHERE name ILIKE '%' || :fragment || '%'",
+    "users.email": "SELECT id FROM users WHERE email ILIKE '%' || :fragment || '%'",
+}
+
+FRAGMENTS = {
+    "posts.title": "a1b2",
+    "posts.description": "c3d4",
+    "tags.name": "tag1234",
+    "users.name": "author 4321",
+    "users.email": "author4321@",
+}
+
+TRIGRAM_INDEXES = (
+    "ix_posts_title_trgm",
+    "ix_posts_description_trgm",
+    "ix_tags_name_trgm",
+    "ix_users_name_trgm",
+    "ix_users_email_trgm",
+)
+
+
+def _scan_nodes(plan):
+    nodes = [plan["Node Type"]]
+    for child in plan.get("Plans", []):
+        nodes.extend(_scan_nodes(child))
+    return [node for node in nodes if "Scan" in node]
+
+
+async def _explain(conn, sql, fragment):
+    result = await conn.execute(
+        text(f"EXPLAIN (ANALYZE, FORMAT JSON) {sql}"), {"fragment": fragment}
+    )
+    raw = result.scalar_one()
+    plan = (json.loads(raw) if isinstance(raw, str) else raw)[0]
+    return _scan_nodes(plan["Plan"]), plan["Execution Time"]
+
+
+async def _report(conn, title):
+    print(title)
+    plans = {}
+    for label, sql in QUERIES.items():
+        scans, elapsed = await _explain(conn, sql, FRAGMENTS[label])
+        plans[label] = scans
+        print(f"  {label:<18} {elapsed:9.2f} ms  {' > '.join(scans)}")
+    return plans
+
+
+async def main(rows=50_000):
+    engine = create_async_engine(settings.DB_URL)
+    async with engine.connect() as conn:
+        transaction = await conn.begin()
+        try:
+            for statement in filter(str.strip, SEED.split(";")):
+                await conn.execute(text(statement), {"rows": rows})
+            await conn.execute(text("ANALYZE users, tags, posts"))
+
+            indexed = await _report(conn, f"with trigram indexes ({rows} rows):")
+
+            for name in TRIGRAM_INDEXES:
+                await conn.execute(text(f"DROP INDEX {name}"))
+            await _report(conn, "without trigram indexes:")
+
+            missed = [label for label, scans in indexed.items() if "Seq Scan" in scans]
+            if missed:
+                print(f"still sequential with the indexes: {', '.join(missed)}")
+        finally:
+            await transaction.rollback()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(*(int(arg) for arg in sys.argv[1:2])))
@@ -1,16 +1,43 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+import logging
 import uvicorn
 from fastapi.middleware.cors import CORSMiddleware
-from src.routes import admin_route, comment_route, rating_route, post_route, auth, search_filter, admin_search, user
+from src.routes import admin_route, comment_route, rating_route, post_route, auth, search_filter, admin_search, user, tag_route
 from slowapi.errors import RateLimitExceeded
 from slowapi import _rate_limit_exceeded_handler
 from src.core.limiter import limiter 
+from src.database.db import sessionmanager
+from src.repositories.rating_repository import apply_rating_deltas
+from src.services.rating_aggregator import rating_aggregator
+from src.services.search_service import load_search_backend
+from src.services.tag_index import load_tag_index
 
-app = FastAPI()
+logger = logging.getLogger("uvicorn.error")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    try:
+        async with sessionmanager.session() as db:
+            await load_tag_index(db)
+            await load_search_backend(db)
+    except Exception as e:
+        # Autocomplete and in-process search stay empty rather than keeping
+        # the API from starting.
+        logger.warning(f"Search indexes not loaded: {e}")
+    rating_aggregator.start(sessionmanager.session, apply_rating_deltas)
+    yield
+    # Buffered rating stats are written before the process exits.
+    await rating_aggregator.stop()
+
+
+app = FastAPI(lifespan=lifespan)
 app.state.limiter = limiter
 app.add_exception_handler(429, _rate_limit_exceeded_handler)
 
 app.include_router(search_filter.router)
+app.include_router(tag_route.router)
 app.include_router(admin_search.router)
 app.include_router(admin_route.router)
 app.include_router(user.router)
@@ -0,0 +1,28 @@
+"""users created_at index
+
+Revision ID: 0e6a9c3f7d21
+Revises: b71e4d2c9f58
+Create Date: 2026-10-18 15:26:33.804117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0e6a9c3f7d21'
+down_revision: Union[str, None] = 'b71e4d2c9f58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_users_created_at', 'users', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_users_created_at', table_name='users')
@@ -0,0 +1,40 @@
+"""posts star bucket
+
+Revision ID: 4a2f8d6e1b95
+Revises: 0e6a9c3f7d21
+Create Date: 2026-10-18 16:02:51.276430
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4a2f8d6e1b95'
+down_revision: Union[str, None] = '0e6a9c3f7d21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('posts', sa.Column('star_bucket', sa.SmallInteger(), nullable=True))
+    op.execute(
+        """
+        UPDATE posts
+        SET star_bucket = floor(stats.avg_rating)::smallint
+        FROM post_rating_stats AS stats
+        WHERE stats.post_id = posts.id AND stats.avg_rating IS NOT NULL
+        """
+    )
+    op.create_index(
+        'ix_posts_star_bucket_created_at_id', 'posts', ['star_bucket', 'created_at', 'id'], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_posts_star_bucket_created_at_id', table_name='posts')
+    op.drop_column('posts', 'star_bucket')
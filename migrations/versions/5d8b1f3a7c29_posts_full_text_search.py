@@ -0,0 +1,60 @@
+"""posts full text search
+
+Revision ID: 5d8b1f3a7c29
+Revises: c52b8e0f6a13
+Create Date: 2026-10-18 13:02:47.115406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d8b1f3a7c29'
+down_revision: Union[str, None] = 'c52b8e0f6a13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+POST_SEARCH_VECTOR = (
+    "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(tag_names, '')), 'B') || "
+    "setweight(to_tsvector('simple', coalesce(description, '')), 'C')"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('posts', sa.Column('tag_names', sa.String(), server_default='', nullable=False))
+    op.execute(
+        """
+        UPDATE posts
+        SET tag_names = tags.names
+        FROM (
+            SELECT post_id, string_agg(tag_name, ' ' ORDER BY tag_name) AS names
+            FROM post_tags
+            WHERE post_id IS NOT NULL
+            GROUP BY post_id
+        ) AS tags
+        WHERE tags.post_id = posts.id
+        """
+    )
+    op.add_column(
+        'posts',
+        sa.Column(
+            'search_vector',
+            postgresql.TSVECTOR(),
+            sa.Computed(POST_SEARCH_VECTOR, persisted=True),
+            nullable=True,
+        ),
+    )
+    op.create_index('ix_posts_search_vector', 'posts', ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_posts_search_vector', table_name='posts', postgresql_using='gin')
+    op.drop_column('posts', 'search_vector')
+    op.drop_column('posts', 'tag_names')
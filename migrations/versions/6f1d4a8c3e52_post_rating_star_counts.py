@@ -0,0 +1,47 @@
+"""post rating star counts
+
+Revision ID: 6f1d4a8c3e52
+Revises: e3a9c57b1f08
+Create Date: 2026-10-18 17:58:22.604719
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6f1d4a8c3e52'
+down_revision: Union[str, None] = 'e3a9c57b1f08'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+STARS = range(1, 6)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for star in STARS:
+        op.add_column(
+            'post_rating_stats',
+            sa.Column(f'star_{star}_count', sa.Integer(), server_default='0', nullable=False),
+        )
+    assignments = ", ".join(f"star_{star}_count = counted.star_{star}_count" for star in STARS)
+    counts = ", ".join(
+        f"COUNT(*) FILTER (WHERE rating = {star}) AS star_{star}_count" for star in STARS
+    )
+    op.execute(
+        f"""
+        UPDATE post_rating_stats AS stats
+        SET {assignments}
+        FROM (SELECT post_id, {counts} FROM post_ratings GROUP BY post_id) AS counted
+        WHERE counted.post_id = stats.post_id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for star in STARS:
+        op.drop_column('post_rating_stats', f'star_{star}_count')
@@ -0,0 +1,34 @@
+"""admin user search indexes
+
+Revision ID: 8d3b6f0a2c47
+Revises: 4a2f8d6e1b95
+Create Date: 2026-10-18 16:41:09.512873
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d3b6f0a2c47'
+down_revision: Union[str, None] = '4a2f8d6e1b95'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_users_type_is_active_created_at', 'users', ['type', 'is_active', 'created_at'], unique=False
+    )
+    op.create_index(
+        'ix_users_sort_name_id', 'users', [sa.text("coalesce(name, '')"), 'id'], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_users_sort_name_id', table_name='users')
+    op.drop_index('ix_users_type_is_active_created_at', table_name='users')
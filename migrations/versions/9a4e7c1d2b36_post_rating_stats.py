@@ -0,0 +1,44 @@
+"""post rating stats
+
+Revision ID: 9a4e7c1d2b36
+Revises: 3f1c2a9d4b70
+Create Date: 2026-10-18 11:03:27.914052
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a4e7c1d2b36'
+down_revision: Union[str, None] = '3f1c2a9d4b70'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('post_rating_stats',
+    sa.Column('post_id', sa.Uuid(), nullable=False),
+    sa.Column('rating_sum', sa.Integer(), nullable=False),
+    sa.Column('rating_count', sa.Integer(), nullable=False),
+    sa.Column('avg_rating', sa.Float(), nullable=True),
+    sa.ForeignKeyConstraint(['post_id'], ['posts.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('post_id')
+    )
+    op.execute(
+        """
+        INSERT INTO post_rating_stats (post_id, rating_sum, rating_count, avg_rating)
+        SELECT post_id, SUM(rating), COUNT(*), AVG(rating)::float
+        FROM post_ratings
+        WHERE post_id IS NOT NULL
+        GROUP BY post_id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('post_rating_stats')
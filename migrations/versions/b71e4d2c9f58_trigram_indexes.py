@@ -0,0 +1,45 @@
+"""trigram indexes
+
+Revision ID: b71e4d2c9f58
+Revises: 5d8b1f3a7c29
+Create Date: 2026-10-18 13:41:09.552830
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b71e4d2c9f58'
+down_revision: Union[str, None] = '5d8b1f3a7c29'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TRIGRAM_INDEXES = (
+    ('ix_posts_title_trgm', 'posts', 'title'),
+    ('ix_posts_description_trgm', 'posts', 'description'),
+    ('ix_tags_name_trgm', 'tags', 'name'),
+    ('ix_users_name_trgm', 'users', 'name'),
+    ('ix_users_email_trgm', 'users', 'email'),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for name, table, column in TRIGRAM_INDEXES:
+        op.create_index(
+            name, table, [column], unique=False,
+            postgresql_using='gin', postgresql_ops={column: 'gin_trgm_ops'},
+        )
+    op.create_index('ix_post_tags_tag_name_post_id', 'post_tags', ['tag_name', 'post_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # The pg_trgm extension is left installed: other objects may depend on it.
+    op.drop_index('ix_post_tags_tag_name_post_id', table_name='post_tags')
+    for name, table, _ in reversed(TRIGRAM_INDEXES):
+        op.drop_index(name, table_name=table, postgresql_using='gin')
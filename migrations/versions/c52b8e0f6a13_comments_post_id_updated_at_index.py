@@ -0,0 +1,28 @@
+"""comments post_id updated_at index
+
+Revision ID: c52b8e0f6a13
+Revises: 9a4e7c1d2b36
+Create Date: 2026-10-18 12:20:05.381920
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c52b8e0f6a13'
+down_revision: Union[str, None] = '9a4e7c1d2b36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_comments_post_id_updated_at', 'comments', ['post_id', 'updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_comments_post_id_updated_at', table_name='comments')
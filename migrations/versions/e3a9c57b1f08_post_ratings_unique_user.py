@@ -0,0 +1,65 @@
+"""post ratings unique per user
+
+Revision ID: e3a9c57b1f08
+Revises: 8d3b6f0a2c47
+Create Date: 2026-10-18 17:12:40.938215
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3a9c57b1f08'
+down_revision: Union[str, None] = '8d3b6f0a2c47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Duplicates left by concurrent double submits: keep one rating each.
+    op.execute(
+        """
+        DELETE FROM post_ratings AS duplicate
+        USING post_ratings AS kept
+        WHERE duplicate.post_id = kept.post_id
+          AND duplicate.user_id = kept.user_id
+          AND duplicate.ctid > kept.ctid
+        """
+    )
+    # Re-derive the aggregates and star buckets of the posts that had them.
+    op.execute(
+        """
+        UPDATE post_rating_stats AS stats
+        SET rating_sum = counted.rating_sum,
+            rating_count = counted.rating_count,
+            avg_rating = counted.rating_sum::float / counted.rating_count
+        FROM (
+            SELECT post_id, SUM(rating) AS rating_sum, COUNT(*) AS rating_count
+            FROM post_ratings
+            GROUP BY post_id
+        ) AS counted
+        WHERE counted.post_id = stats.post_id
+          AND counted.rating_count <> stats.rating_count
+        """
+    )
+    op.execute(
+        """
+        UPDATE posts
+        SET star_bucket = floor(stats.avg_rating)::smallint
+        FROM post_rating_stats AS stats
+        WHERE stats.post_id = posts.id
+          AND posts.star_bucket IS DISTINCT FROM floor(stats.avg_rating)::smallint
+        """
+    )
+    op.create_index(
+        'ix_post_ratings_post_id_user_id', 'post_ratings', ['post_id', 'user_id'], unique=True
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_post_ratings_post_id_user_id', table_name='post_ratings')
@@ -1,6 +1,7 @@
 from pathlib import Path
 from pydantic_settings import BaseSettings
 from pydantic import ConfigDict
+from typing import Literal
 import os
 
 env_name = os.getenv("ENV_APP", "development")
@@ -21,6 +22,26 @@ class Settings(BaseSettings):
     CLD_API_KEY: int
     CLD_API_SECRET: str
 
+    POST_CACHE_TTL_SECONDS: int = 30
+    POST_CACHE_MAX_ENTRIES: int = 10_000
+    POST_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+
+    SEARCH_CACHE_TTL_SECONDS: int = 15
+    SEARCH_CACHE_MAX_ENTRIES: int = 2_000
+    SEARCH_CACHE_MAX_BYTES: int = 32 * 1024 * 1024
+
+    # "postgres": full-text search in the database; "memory": in-process BM25
+    # index, for databases without Postgres FTS.
+    SEARCH_BACKEND: Literal["postgres", "memory"] = "postgres"
+    SEARCH_MEMORY_MAX_HITS: int = 1000
+
+    # Ratings are inserted at once, but their post_rating_stats deltas are
+    # buffered per post and written in batches, so a burst on one post takes
+    # its stats row lock once per batch. The interval bounds how stale the
+    # aggregates and star buckets can be; 0 writes them with each rating.
+    RATING_FLUSH_INTERVAL_MS: int = 250
+    RATING_FLUSH_MAX_EVENTS: int = 500
+
     model_config = ConfigDict(
         env_file=env_file,                    
         env_file_encoding="utf-8",            
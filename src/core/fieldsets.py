@@ -0,0 +1,26 @@
+from typing import Optional
+
+from fastapi import HTTPException, status
+from pydantic import BaseModel
+
+
+def parse_fields(
+    fields: Optional[str], model: type[BaseModel], label: str = "fields"
+) -> Optional[frozenset[str]]:
+    """Turn ``?fields=a,b`` into the set of ``model`` fields the client asked for.
+
+    ``None`` means the full representation. ``label`` names the parameter in
+    the error for unknown names.
+    """
+    if not fields:
+        return None
+
+    requested = frozenset(name.strip() for name in fields.split(",") if name.strip())
+    unknown = requested - model.model_fields.keys()
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown {label}: {', '.join(sorted(unknown))}",
+        )
+
+    return requested or None
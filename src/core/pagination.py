@@ -0,0 +1,44 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from uuid import UUID
+
+from fastapi import HTTPException, status
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+def _dump(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+def _load(kind, value):
+    if kind is datetime:
+        return datetime.fromisoformat(value)
+    return kind(value)
+
+
+def encode_cursor(*values) -> str:
+    """Pack the sort key of the last row on a page into an opaque token."""
+    payload = json.dumps([_dump(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, *kinds) -> tuple:
+    """Unpack a token made by encode_cursor, converting each value to the given type."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded))
+        if not isinstance(values, list) or len(values) != len(kinds):
+            raise ValueError("cursor shape mismatch")
+        return tuple(_load(kind, value) for kind, value in zip(kinds, values))
+    except (ValueError, TypeError, binascii.Error):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        )
@@ -0,0 +1,33 @@
+from typing import AsyncIterator, Callable, Optional
+
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database.db import sessionmanager
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+STREAM_BATCH_SIZE = 500
+
+
+def wants_ndjson(request: Request, stream: bool = False) -> bool:
+    return stream or NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def ndjson_response(
+    produce: Callable[[AsyncSession], AsyncIterator[BaseModel]],
+    include: Optional[frozenset[str]] = None,
+) -> StreamingResponse:
+    """Stream one JSON document per line as ``produce`` yields them.
+
+    The body outlives the request's ``get_db`` session, so the stream opens
+    its own session and keeps it (and its server-side cursor) until the last
+    row has been sent.
+    """
+    async def body():
+        async with sessionmanager.session() as session:
+            async for item in produce(session):
+                yield item.model_dump_json(include=include) + "\n"
+
+    return StreamingResponse(body(), media_type=NDJSON_MEDIA_TYPE)
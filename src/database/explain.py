@@ -0,0 +1,26 @@
+import json
+
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+
+class Explain(Executable, ClauseElement):
+    """``EXPLAIN (FORMAT JSON)`` of a statement, keeping its bound parameters."""
+
+    inherit_cache = False
+
+    def __init__(self, stmt, analyze: bool = False):
+        self.stmt = stmt
+        self.analyze = analyze
+
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element, compiler, **kw):
+    options = "ANALYZE, FORMAT JSON" if element.analyze else "FORMAT JSON"
+    return f"EXPLAIN ({options}) " + compiler.process(element.stmt, **kw)
+
+
+def plan_of(raw) -> dict:
+    """Top-level plan node of an EXPLAIN (FORMAT JSON) result value."""
+    document = json.loads(raw) if isinstance(raw, str) else raw
+    return document[0]["Plan"]
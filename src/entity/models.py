@@ -1,19 +1,41 @@
 from sqlalchemy import (
     String,
     Boolean,
+    Computed,
     DateTime,
     Enum,
+    Float,
     Integer,
+    SmallInteger,
     ForeignKey,
-    func
+    Index,
+    func,
+    text
 )
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import relationship, declarative_base, Mapped, mapped_column
+from sqlalchemy.schema import CreateColumn
 from datetime import datetime
 from uuid import uuid4, UUID
 import enum
 
 Base = declarative_base()
 
+def trigram_index(name: str, column: str) -> Index:
+    """GIN pg_trgm index, so ``ILIKE '%fragment%'`` can avoid a sequential scan."""
+    return Index(
+        name, column, postgresql_using="gin", postgresql_ops={column: "gin_trgm_ops"}
+    ).ddl_if(dialect="postgresql")
+
+@compiles(CreateColumn)
+def _skip_postgresql_only_columns(element, compiler, **kw):
+    # Columns marked ``info={"postgresql_only": True}`` (full-text vectors)
+    # are left out of CREATE TABLE elsewhere, e.g. for SQLite test databases.
+    if element.element.info.get("postgresql_only") and compiler.dialect.name != "postgresql":
+        return None
+    return compiler.visit_create_column(element, **kw)
+
 class UserTypeEnum(str, enum.Enum):
     user = "user"
     moderator = "moderator"
@@ -33,13 +55,31 @@ class User(Base):
     img_link: Mapped[str] = mapped_column(String, nullable=True)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
-    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     posts: Mapped[list["Post"]] = relationship("Post", back_populates="user")
     comments: Mapped[list["Comment"]] = relationship("Comment", back_populates="user")
     ratings: Mapped[list["PostRating"]] = relationship("PostRating", back_populates="user")
     refresh_tokens: Mapped[list["RefreshToken"]] = relationship("RefreshToken", back_populates="user")
 
+    __table_args__ = (
+        trigram_index("ix_users_name_trgm", "name"),
+        trigram_index("ix_users_email_trgm", "email"),
+        Index("ix_users_created_at", "created_at"),
+        # Admin search: role/active filters with a registration date range,
+        # and keyset paging by name (NULL names sort as '').
+        Index("ix_users_type_is_active_created_at", "type", "is_active", "created_at"),
+        Index("ix_users_sort_name_id", text("coalesce(name, '')"), "id"),
+    )
+
+# 'simple' keeps the vector language-neutral: posts are written in more than
+# one language, so no stemming or stop words.
+POST_SEARCH_VECTOR = (
+    "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(tag_names, '')), 'B') || "
+    "setweight(to_tsvector('simple', coalesce(description, '')), 'C')"
+)
+
 class Post(Base):
     __tablename__ = "posts"
     id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid4)
@@ -50,11 +90,35 @@ class Post(Base):
     location: Mapped[str] = mapped_column(String, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    # Space-separated copy of the post's tag names, written with the post so
+    # the generated search_vector can cover tags (generated columns cannot
+    # read other tables).
+    tag_names: Mapped[str] = mapped_column(String, nullable=False, default="", server_default="")
+    # floor(avg_rating) from post_rating_stats (1-5), NULL until the first rating.
+    star_bucket: Mapped[int] = mapped_column(SmallInteger, nullable=True)
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed(POST_SEARCH_VECTOR, persisted=True),
+        deferred=True,
+        info={"postgresql_only": True},
+    )
 
     user: Mapped["User"] = relationship("User", back_populates="posts")
     comments: Mapped[list["Comment"]] = relationship("Comment", back_populates="post")
     tags: Mapped[list["PostTag"]] = relationship("PostTag", back_populates="post")
     ratings: Mapped[list["PostRating"]] = relationship("PostRating", back_populates="post")
+    rating_stats: Mapped["PostRatingStats"] = relationship(
+        "PostRatingStats", back_populates="post", uselist=False
+    )
+
+    __table_args__ = (
+        Index("ix_posts_created_at_id", "created_at", "id"),
+        Index("ix_posts_user_id_created_at_id", "user_id", "created_at", "id"),
+        Index("ix_posts_star_bucket_created_at_id", "star_bucket", "created_at", "id"),
+        Index("ix_posts_search_vector", "search_vector", postgresql_using="gin").ddl_if(dialect="postgresql"),
+        trigram_index("ix_posts_title_trgm", "title"),
+        trigram_index("ix_posts_description_trgm", "description"),
+    )
 
 class Comment(Base):
     __tablename__ = "comments"
@@ -69,12 +133,20 @@ class Comment(Base):
     user: Mapped["User"] = relationship("User", back_populates="comments")
     post: Mapped["Post"] = relationship("Post", back_populates="comments")
 
+    __table_args__ = (
+        Index("ix_comments_post_id_updated_at", "post_id", "updated_at"),
+    )
+
 class Tag(Base):
     __tablename__ = "tags"
     name: Mapped[str] = mapped_column(String, primary_key=True)
 
     post_tags: Mapped[list["PostTag"]] = relationship("PostTag", back_populates="tag")
 
+    __table_args__ = (
+        trigram_index("ix_tags_name_trgm", "name"),
+    )
+
 class PostTag(Base):
     __tablename__ = "post_tags"
     id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid4)
@@ -83,6 +155,10 @@ class PostTag(Base):
     post: Mapped["Post"] = relationship("Post", back_populates="tags")
     tag: Mapped["Tag"] = relationship("Tag", back_populates="post_tags")
 
+    __table_args__ = (
+        Index("ix_post_tags_tag_name_post_id", "tag_name", "post_id"),
+    )
+
 class PostRating(Base):
     __tablename__ = "post_ratings"
     id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid4)
@@ -93,6 +169,26 @@ class PostRating(Base):
     user: Mapped["User"] = relationship("User", back_populates="ratings")
     post: Mapped["Post"] = relationship("Post", back_populates="ratings")
 
+    __table_args__ = (
+        # One rating per user and post, enforced by the database.
+        Index("ix_post_ratings_post_id_user_id", "post_id", "user_id", unique=True),
+    )
+
+class PostRatingStats(Base):
+    __tablename__ = "post_rating_stats"
+    post_id: Mapped[UUID] = mapped_column(ForeignKey("posts.id", ondelete="CASCADE"), primary_key=True)
+    rating_sum: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    rating_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    avg_rating: Mapped[float] = mapped_column(Float, nullable=True)
+    # Ratings per star value, for the rating histogram.
+    star_1_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    star_2_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    star_3_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    star_4_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    star_5_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+
+    post: Mapped["Post"] = relationship("Post", back_populates="rating_stats")
+
 class RefreshToken(Base):
     __tablename__ = "refresh_tokens"
     id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid4)
@@ -1,60 +1,81 @@
-from datetime import timedelta
+from datetime import datetime
+from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, or_, asc, desc, cast, Date
+from sqlalchemy import select, asc, desc, func, literal_column, tuple_
+from src.core.pagination import decode_cursor, encode_cursor
 from src.entity.models import User
-from typing import List
+from src.repositories.search_compiler import compile_user_filters
 from uuid import UUID
-from src.schemas.admin_search import UserSearchRequest
+from src.schemas.admin_search import UserOut, UserSearchPage, UserSearchRequest
+
+# Only the columns UserOut renders; the password hash never leaves the table.
+USER_OUT_COLUMNS = tuple(getattr(User, name) for name in UserOut.model_fields)
+# Matches the ix_users_sort_name_id expression, so name ordering walks the
+# index. The literal must stay inline: a bound parameter would not match it.
+USER_SORT_NAME = func.coalesce(User.name, literal_column("''"))
+
+
+def _sort_key(filters: UserSearchRequest):
+    """The ORDER BY expression for the requested sort and the type of its cursor value."""
+    if filters.sort_by == "registration_date":
+        return User.created_at, datetime
+    return USER_SORT_NAME, str
+
+
+def _cursor_sort(filters: UserSearchRequest) -> str:
+    return f"{filters.sort_by}:{filters.sort_order}"
+
+
+def build_user_search_stmt(filters: UserSearchRequest, include_inactive: bool = False):
+    stmt = select(*USER_OUT_COLUMNS).where(
+        *compile_user_filters(filters, include_inactive=include_inactive)
+    )
+
+    sort_key, kind = _sort_key(filters)
+    if filters.cursor:
+        # A cursor only continues the sort that produced it.
+        sort, value, user_id = decode_cursor(filters.cursor, str, kind, UUID)
+        if sort != _cursor_sort(filters):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+            )
+        if filters.sort_order == "desc":
+            stmt = stmt.where(tuple_(sort_key, User.id) < tuple_(value, user_id))
+        else:
+            stmt = stmt.where(tuple_(sort_key, User.id) > tuple_(value, user_id))
+
+    # User.id breaks ties, so keyset pages neither repeat nor skip users.
+    if filters.sort_order == "desc":
+        return stmt.order_by(desc(sort_key), desc(User.id))
+    return stmt.order_by(asc(sort_key), asc(User.id))
+
 
 async def search_users(
     db: AsyncSession,
     filters: UserSearchRequest,
     current_user_is_admin: bool = False,
-) -> List[User]:
-    stmt = select(User)
-    conditions = []
-
-    if filters.search:
-        words = [word.strip() for word in filters.search.split(',') if word.strip()]
-        word_conditions = [
-            or_(
-                User.name.ilike(f"%{word}%"),
-                User.email.ilike(f"%{word}%")
-            ) for word in words
-        ]
-        conditions.append(or_(*word_conditions))
-
-    if filters.role:
-        conditions.append(User.type == filters.role)
-
-    if not current_user_is_admin:
-        conditions.append(User.is_active == True)
-
-    if filters.reg_date_from and filters.reg_date_to:
-        reg_date_to = filters.reg_date_to + timedelta(days=1)
-        conditions.append(User.created_at.between(filters.reg_date_from, reg_date_to))
-    elif filters.reg_date_from:
-        conditions.append(cast(User.created_at, Date) == filters.reg_date_from.date())
-    elif filters.reg_date_to:
-        conditions.append(cast(User.created_at, Date) == filters.reg_date_to.date())
-
-    if conditions:
-        stmt = stmt.where(and_(*conditions))
-
-    sort_column = {
-        "name": User.name,
-        "registration_date": User.created_at
-    }.get(filters.sort_by, User.name)
-
-    if filters.sort_order == "desc":
-        stmt = stmt.order_by(desc(sort_column))
-    else:
-        stmt = stmt.order_by(asc(sort_column))
+) -> UserSearchPage:
+    sort_key, _ = _sort_key(filters)
+    stmt = (
+        build_user_search_stmt(filters, include_inactive=current_user_is_admin)
+        .add_columns(sort_key.label("sort_key"))
+        .limit(filters.limit + 1)
+    )
 
     result = await db.execute(stmt)
-    return result.scalars().all()
+    rows = result.mappings().all()
+
+    next_cursor = None
+    if len(rows) > filters.limit:
+        rows = rows[:filters.limit]
+        next_cursor = encode_cursor(_cursor_sort(filters), rows[-1]["sort_key"], rows[-1]["id"])
+
+    return UserSearchPage(
+        items=[UserOut.model_validate(dict(row)) for row in rows],
+        next_cursor=next_cursor,
+    )
 
 
 async def get_user_by_id(user_id: UUID, db: AsyncSession):
     result = await db.execute(select(User).filter(User.id == user_id))
-    return result.scalars().first()
\ No newline at end of file
+    return result.scalars().first()
@@ -1,4 +1,5 @@
 from sqlalchemy.future import select
+from src.core.streaming import STREAM_BATCH_SIZE
 from src.entity.models import User
 
 class AdminUserRepository:
@@ -9,6 +10,15 @@ class AdminUserRepository:
         result = await self.db.execute(select(User))
         return result.scalars().all()
 
+    async def admin_stream_users(self):
+        result = await self.db.stream_scalars(
+            select(User)
+            .order_by(User.created_at, User.id)
+            .execution_options(yield_per=STREAM_BATCH_SIZE)
+        )
+        async for user in result:
+            yield user
+
     async def admin_get_user_by_id(self, user_id):
         return await self.db.get(User, user_id)
 
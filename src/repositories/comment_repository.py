@@ -1,5 +1,5 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import func, select
 from sqlalchemy.orm import selectinload
 from src.entity.models import Comment
 from uuid import UUID
@@ -39,6 +39,7 @@ class CommentRepository:
         if comment is None:
             return False
         comment.is_deleted = True
+        comment.updated_at = datetime.utcnow()
         await self.db.commit()
         return True
 
@@ -51,6 +52,14 @@ class CommentRepository:
         )
         return result.scalars().all()
 
+    async def get_post_comments_version(self, post_id: UUID) -> tuple[int, datetime | None]:
+        result = await self.db.execute(
+            select(func.count(Comment.id), func.max(Comment.updated_at))
+            .where(Comment.post_id == post_id)
+        )
+        count, last_modified = result.one()
+        return count, last_modified
+
     async def get_by_id(self, comment_id: UUID) -> Comment | None:
         result = await self.db.execute(
             select(Comment)
@@ -1,3 +1,4 @@
+from datetime import datetime
 from fastapi import HTTPException
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -5,6 +6,7 @@ from sqlalchemy import update, select
 from src.entity.models import User
 from src.schemas.users import UserProfileUpdate
 from src.core.security import get_password_hash
+from src.services.cache import post_cache, search_cache
 
 
 async def update_user_profile(user_id: UUID, data: UserProfileUpdate, db: AsyncSession, avatar_url: str = None):
@@ -24,7 +26,14 @@ async def update_user_profile(user_id: UUID, data: UserProfileUpdate, db: AsyncS
 
     if avatar_url:
         user.img_link = avatar_url
-    
+
+    # Set explicitly so an avatar-only edit still moves the version that the
+    # ETags of this user's posts are made from.
+    user.updated_at = datetime.utcnow()
+
     await db.commit()
+    # Cached posts and search pages embed the author's name and avatar.
+    post_cache.invalidate_where(lambda post: post.user_id == user_id)
+    search_cache.clear()
     await db.refresh(user)
     return user
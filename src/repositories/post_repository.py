@@ -2,16 +2,29 @@ from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import joinedload, selectinload
-from sqlalchemy.sql import func
+from sqlalchemy import Uuid, any_, bindparam, insert
+from sqlalchemy.dialects.postgresql import ARRAY, insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.sql import func, tuple_
 from sqlalchemy.sql.expression import Delete, Update
-from src.entity.models import Post, PostTag, Tag
-from src.schemas.post import PostResponse, PostCreateResponse, TagsShortResponse
-from typing import Optional
-from uuid import UUID
-from sqlalchemy.ext.asyncio import AsyncSession
+from src.core.pagination import DEFAULT_PAGE_SIZE, decode_cursor, encode_cursor
+from src.core.streaming import STREAM_BATCH_SIZE
+from src.services.search_backend import search_backend
+from src.services.tag_index import tag_index
+from src.entity.models import Post, PostRatingStats, PostTag, Tag, User
+from src.schemas.post import (
+    PostCreateModel, PostResponse, PostCreateResponse, PostPage, TagsShortResponse,
+    UserShortResponse
+)
+from typing import AsyncIterator, Optional
+from uuid import UUID, uuid4
 
 import datetime
 
+POST_COLUMNS = (
+    "id", "title", "user_id", "description", "image_url", "location", "created_at", "updated_at"
+)
+
 class PostRepository:
     def __init__(self, db: AsyncSession, user = None, user_id = None):
         self.db = db
@@ -20,50 +33,69 @@ class PostRepository:
 
     async def create(
             self, 
-            post_data: dict
-        ) -> Post:
-
-        post = Post(
-            user_id=self.user.id, 
-            title=post_data.title, 
-            description=post_data.description,
-            image_url=post_data.image_url,
-            location=post_data.location,
-            created_at = datetime.datetime.now(),
-            updated_at = datetime.datetime.now()
-        )
-
-        self.db.add(post)
-        await self.db.flush()
-
-        tag_names = post_data.tags
-
-        for tag_model in tag_names:
-            stmt = select(Tag).where(Tag.name == tag_model.name)
-            result = await self.db.execute(stmt)
-            tag = result.scalar_one_or_none()
+            post_data: PostCreateModel
+        ) -> PostCreateResponse:
+        created = await self.create_many([post_data])
+
+        return created[0]
+
+    async def create_many(
+            self,
+            posts_data: list[PostCreateModel]
+        ) -> list[PostCreateResponse]:
+        # Set-based writes: one multi-row INSERT for the posts, one
+        # INSERT ... ON CONFLICT DO NOTHING for all their tags, one multi-row
+        # INSERT for the links and a single commit, however many tags there are.
+        now = datetime.datetime.now()
+
+        tag_names_per_post = [
+            list(dict.fromkeys(tag.name for tag in post_data.tags))
+            for post_data in posts_data
+        ]
+        post_rows = [
+            {
+                "id": uuid4(),
+                "user_id": self.user.id,
+                "title": post_data.title,
+                "description": post_data.description,
+                "image_url": post_data.image_url,
+                "location": post_data.location,
+                "created_at": now,
+                "updated_at": now,
+                "tag_names": " ".join(post_tag_names),
+            }
+            for post_data, post_tag_names in zip(posts_data, tag_names_per_post)
+        ]
+        post_tag_rows = [
+            {"id": uuid4(), "post_id": post_row["id"], "tag_name": tag_name}
+            for post_row, post_tag_names in zip(post_rows, tag_names_per_post)
+            for tag_name in post_tag_names
+        ]
+        # Sorted so concurrent writers take the tag row locks in the same order.
+        tag_names = sorted({row["tag_name"] for row in post_tag_rows})
 
-            if not tag:
-                tag = Tag(name=tag_model.name)
-                self.db.add(tag)
-                await self.db.flush()
+        await self.db.execute(insert(Post).values(post_rows))
 
-            stmt = select(PostTag).where(
-                PostTag.post_id == post.id, 
-                PostTag.tag_name == tag_model.name
+        if tag_names:
+            dialect_insert = sqlite_insert if self.db.get_bind().dialect.name == "sqlite" else pg_insert
+            await self.db.execute(
+                dialect_insert(Tag)
+                .values([{"name": name} for name in tag_names])
+                .on_conflict_do_nothing(index_elements=[Tag.name])
             )
-            result = await self.db.execute(stmt)
-            post_tag_exists = result.scalar_one_or_none()
+            await self.db.execute(insert(PostTag).values(post_tag_rows))
 
-            if not post_tag_exists:
-                post_tag = PostTag(post_id=post.id, tag_name=tag_model.name)
-                self.db.add(post_tag)
-                
-            await self.db.commit()
-            await self.db.refresh(post)
-        post_response = PostCreateResponse.model_validate(post)
+        await self.db.commit()
+        tag_index.add(row["tag_name"] for row in post_tag_rows)
+        for post_row in post_rows:
+            search_backend.index_post(
+                post_row["id"], post_row["title"], post_row["description"], post_row["tag_names"]
+            )
 
-        return post_response
+        return [
+            PostCreateResponse(id=post_row["id"], image_url=post_row["image_url"])
+            for post_row in post_rows
+        ]
 
     async def get_post(self, post_id: UUID) -> Post:
         stmt = (
@@ -71,7 +103,7 @@ class PostRepository:
             .options(
                 joinedload(Post.user),
                 selectinload(Post.tags).selectinload(PostTag.tag),
-                selectinload(Post.ratings)
+                joinedload(Post.rating_stats)
             )
             .where(Post.id == post_id)
         )
@@ -84,12 +116,7 @@ class PostRepository:
             raise HTTPException(status_code=404, detail="Post not found")
         
         post_response = PostResponse.model_validate(post)
-        
-        post_response.avg_rating = (
-            round(sum(r.rating for r in post.ratings) / len(post.ratings), 2)
-            if post.ratings else None
-        )
-        post_response.rating_count = len(post.ratings)
+        post_response.avg_rating, post_response.rating_count = self._rating_fields(post)
 
         post_response.tags = []
         post_response.tags = [
@@ -97,101 +124,294 @@ class PostRepository:
             for tag_rel in post.tags
             if tag_rel.tag is not None
         ]
+        post_response._version = (
+            post.updated_at, post_response.rating_count, post.user.updated_at if post.user else None
+        )
 
         return post_response
     
-    async def get_user_posts(self) -> list[Post]:
-        user_id = self.user_id
-
-        stmt = (select(
-            Post
-        ).options(
-            joinedload(Post.user),
-            selectinload(Post.tags).selectinload(PostTag.tag),
-            selectinload(Post.ratings)
-        ).where(Post.user_id == user_id)
-        .order_by(Post.created_at.desc())
+    async def get_post_version(self, post_id: UUID) -> tuple:
+        # Primary-key lookups only: enough to tell whether a client's copy of
+        # the post is still current without building the response.
+        stmt = (
+            select(Post.updated_at, PostRatingStats.rating_count, User.updated_at.label("user_updated_at"))
+            .join(User, User.id == Post.user_id)
+            .outerjoin(PostRatingStats, PostRatingStats.post_id == Post.id)
+            .where(Post.id == post_id)
         )
 
         result = await self.db.execute(stmt)
 
-        posts = result.scalars().all()
-    
-        posts_response = []
+        row = result.first()
+
+        if not row:
+            raise HTTPException(status_code=404, detail="Post not found")
 
-        for post in posts:
-            avg = round(sum(r.rating for r in post.ratings) / len(post.ratings), 2) if post.ratings else None
-            count = len(post.ratings)
+        return row.updated_at, row.rating_count or 0, row.user_updated_at
 
-            post_response = PostResponse.model_validate(post)
-            post_response.avg_rating = avg
-            post_response.rating_count = count
+    async def get_post_fields(self, post_id: UUID, fields: frozenset[str]) -> PostResponse:
+        # The version columns come along so the sparse response has its ETag
+        # without a separate probe.
+        stmt = self._listing_stmt(fields, versioned=True).where(Post.id == post_id)
 
-            post_response.tags = [
-            TagsShortResponse.model_validate(tag_rel.tag)
-                for tag_rel in post.tags
-                if tag_rel.tag is not None
-            ]
+        result = await self.db.execute(stmt)
 
-            posts_response.append(post_response)
+        row = result.first()
 
-        return posts_response
-    
-    async def get_posts(self) -> list[Post]:
-        stmt = (select(
-            Post
-        ).join(Post.user)
-        .where(Post.user.has(is_active=True))
-        .options(
-            joinedload(Post.user),
-            selectinload(Post.tags).selectinload(PostTag.tag),
-            selectinload(Post.ratings)
-        ).order_by(Post.created_at.desc())
-        )
+        if not row:
+            raise HTTPException(status_code=404, detail="Post not found")
+
+        return self._row_to_response(row, fields)
+
+    async def get_posts_by_ids(self, post_ids: list[UUID]) -> list[PostResponse]:
+        # A single array parameter keeps the statement text (and its cached
+        # plan) the same whatever the number of ids.
+        ids = bindparam("post_ids", post_ids, type_=ARRAY(Uuid))
+        stmt = self._listing_stmt().where(Post.id == any_(ids))
 
         result = await self.db.execute(stmt)
 
-        posts = result.scalars().all()
+        return [self._row_to_response(row) for row in result.all()]
+
+    async def get_user_posts(
+            self,
+            limit: int = DEFAULT_PAGE_SIZE,
+            cursor: Optional[str] = None,
+            fields: Optional[frozenset[str]] = None
+        ) -> PostPage:
+        stmt = self._listing_stmt(fields).where(Post.user_id == self.user_id)
+
+        return await self._get_page(stmt, limit, cursor, fields)
     
-        posts_response = []
+    async def get_posts(
+            self,
+            limit: int = DEFAULT_PAGE_SIZE,
+            cursor: Optional[str] = None,
+            fields: Optional[frozenset[str]] = None
+        ) -> PostPage:
+        stmt = self._listing_stmt(fields, join_user=True).where(User.is_active == True)
+
+        return await self._get_page(stmt, limit, cursor, fields)
+
+    @staticmethod
+    def _listing_stmt(
+            fields: Optional[frozenset[str]] = None,
+            join_user: bool = False,
+            source=None,
+            versioned: bool = False
+        ):
+        # Select exactly the columns PostResponse renders so listings come
+        # back as plain rows: tags are folded into an array per post and the
+        # rating comes from the single post_rating_stats row. With a sparse
+        # fieldset the author join, tag aggregate and rating join are only
+        # added when a requested field needs them; id and created_at are
+        # always selected because the keyset cursor is built from them.
+        # ``source`` lets the same projection read from a CTE of post rows
+        # (e.g. UPDATE ... RETURNING) instead of the posts table.
+        # ``versioned`` adds what PostResponse.version needs; full rows
+        # always carry it.
+        post = Post.__table__ if source is None else source
+        wanted = fields or PostResponse.model_fields.keys()
+        versioned = versioned or not fields
+        with_user = "user" in wanted
+        with_ratings = "avg_rating" in wanted or "rating_count" in wanted or versioned
+
+        columns = {"id": post.c.id, "created_at": post.c.created_at}
+        for name in POST_COLUMNS:
+            if name in wanted or (name == "user_id" and with_user):
+                columns[name] = post.c[name]
+
+        if with_user:
+            columns["user_name"] = User.name.label("user_name")
+            columns["user_img_link"] = User.img_link.label("user_img_link")
+
+        if versioned:
+            columns["updated_at"] = post.c.updated_at
+            columns["user_updated_at"] = User.updated_at.label("user_updated_at")
+
+        if with_ratings:
+            columns["avg_rating"] = PostRatingStats.avg_rating
+            columns["rating_count"] = PostRatingStats.rating_count
+
+        if "tags" in wanted:
+            columns["tag_names"] = (
+                select(func.array_agg(PostTag.tag_name))
+                .where(PostTag.post_id == post.c.id)
+                .correlate(post)
+                .scalar_subquery()
+                .label("tag_names")
+            )
+
+        stmt = select(*columns.values()).select_from(post)
+
+        if with_user or join_user or versioned:
+            stmt = stmt.join(User, User.id == post.c.user_id)
+
+        if with_ratings:
+            stmt = stmt.outerjoin(PostRatingStats, PostRatingStats.post_id == post.c.id)
+
+        return stmt
+
+    @staticmethod
+    def _row_to_response(row, fields: Optional[frozenset[str]] = None) -> PostResponse:
+        response = PostRepository._row_values_to_response(row, fields)
+        if hasattr(row, "user_updated_at"):
+            response._version = (row.updated_at, row.rating_count or 0, row.user_updated_at)
+        return response
+
+    @staticmethod
+    def _row_values_to_response(row, fields: Optional[frozenset[str]] = None) -> PostResponse:
+        # Rows come from typed columns, so validation would only re-check
+        # what the database already guarantees.
+        if fields is None:
+            return PostResponse.model_construct(
+                id=row.id,
+                title=row.title,
+                user_id=row.user_id,
+                description=row.description,
+                image_url=row.image_url,
+                location=row.location,
+                created_at=row.created_at,
+                updated_at=row.updated_at,
+                avg_rating=round(row.avg_rating, 2) if row.rating_count else None,
+                rating_count=row.rating_count or 0,
+                user=UserShortResponse.model_construct(
+                    id=row.user_id, name=row.user_name, img_link=row.user_img_link
+                ),
+                tags=[TagsShortResponse.model_construct(name=name) for name in row.tag_names or ()],
+            )
+
+        values = {name: getattr(row, name) for name in POST_COLUMNS if name in fields}
+        if "avg_rating" in fields:
+            values["avg_rating"] = round(row.avg_rating, 2) if row.rating_count else None
+        if "rating_count" in fields:
+            values["rating_count"] = row.rating_count or 0
+        if "user" in fields:
+            values["user"] = UserShortResponse.model_construct(
+                id=row.user_id, name=row.user_name, img_link=row.user_img_link
+            )
+        if "tags" in fields:
+            values["tags"] = [TagsShortResponse.model_construct(name=name) for name in row.tag_names or ()]
+
+        return PostResponse.model_construct(**values)
+
+    @staticmethod
+    def _keyset(stmt, cursor: Optional[str]):
+        # Keyset pagination on (created_at, id): the cursor is the sort key of
+        # the last post already sent, so every page is an index range scan
+        # no matter how deep the client has scrolled.
+        if cursor:
+            created_at, post_id = decode_cursor(cursor, datetime.datetime, UUID)
+            stmt = stmt.where(
+                tuple_(Post.created_at, Post.id) < tuple_(created_at, post_id)
+            )
 
-        for post in posts:
-            avg = round(sum(r.rating for r in post.ratings) / len(post.ratings), 2) if post.ratings else None
-            count = len(post.ratings)
+        return stmt.order_by(Post.created_at.desc(), Post.id.desc())
 
-            post_response = PostResponse.model_validate(post)
-            post_response.avg_rating = avg
-            post_response.rating_count = count
+    async def stream_posts(
+            self,
+            cursor: Optional[str] = None,
+            fields: Optional[frozenset[str]] = None
+        ) -> AsyncIterator[PostResponse]:
+        stmt = self._keyset(
+            self._listing_stmt(fields, join_user=True).where(User.is_active == True), cursor
+        )
 
-            post_response.tags = [
-            TagsShortResponse.model_validate(tag_rel.tag)
-                for tag_rel in post.tags
-                if tag_rel.tag is not None
-            ]
+        result = await self.db.stream(
+            stmt.execution_options(yield_per=STREAM_BATCH_SIZE)
+        )
+
+        async for row in result:
+            yield self._row_to_response(row, fields)
 
-            posts_response.append(post_response)
+    async def _get_page(
+            self,
+            stmt,
+            limit: int,
+            cursor: Optional[str],
+            fields: Optional[frozenset[str]] = None
+        ) -> PostPage:
+        stmt = self._keyset(stmt, cursor).limit(limit + 1)
 
-        return posts_response
+        result = await self.db.execute(stmt)
+
+        rows = result.all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+
+        return PostPage(
+            items=[self._row_to_response(row, fields) for row in rows],
+            next_cursor=next_cursor
+        )
     
-    async def update_post(self, post_id: UUID, description: Optional[str]) -> Post:
+    @staticmethod
+    def _rating_fields(post: Post) -> tuple[Optional[float], int]:
+        stats = post.rating_stats
+        if stats is None or not stats.rating_count:
+            return None, 0
+        return round(stats.avg_rating, 2), stats.rating_count
+
+    async def update_post(self, post_id: UUID, description: Optional[str]) -> PostResponse:
+        # Authorship check, write and read-back in one statement: the UPDATE
+        # only matches the caller's own post (any post for admins) and the
+        # response is projected from its RETURNING row.
         stmt = Update(Post).where(Post.id == post_id).values(
             description=description,
             updated_at = datetime.datetime.now()
         )
-        await self.db.execute(stmt)
+        if self.user.type != "admin":
+            stmt = stmt.where(Post.user_id == self.user.id)
+
+        updated = stmt.returning(*(Post.__table__.c[name] for name in POST_COLUMNS)).cte("updated_post")
+
+        result = await self.db.execute(self._listing_stmt(source=updated))
+        row = result.first()
         await self.db.commit()
 
-        post = await self.get_post(post_id)
+        if row is None:
+            raise await self._mutation_error(post_id, "update")
 
-        return post
+        search_backend.index_post(row.id, row.title, row.description, " ".join(row.tag_names or ()))
+        return self._row_to_response(row)
     
     async def delete_post(self, post_id: UUID) -> bool:
         stmt = Delete(Post).where(Post.id == post_id)
+        if self.user.type != "admin":
+            stmt = stmt.where(Post.user_id == self.user.id)
+
         result = await self.db.execute(stmt)
         await self.db.commit()
 
-        return result.rowcount > 0
+        if result.rowcount == 0:
+            raise await self._mutation_error(post_id, "delete")
+
+        search_backend.remove_post(post_id)
+        return True
+
+    async def get_search_documents(self) -> list[tuple]:
+        """``(id, title, description, tag_names)`` of every post, for in-process search indexes."""
+        result = await self.db.execute(
+            select(Post.id, Post.title, Post.description, Post.tag_names)
+        )
+        return [tuple(row) for row in result.all()]
+
+    async def get_post_owner(self, post_id: UUID):
+        """Authorization probe: the post's ``(id, user_id)`` or None if it does not exist."""
+        result = await self.db.execute(
+            select(Post.id, Post.user_id).where(Post.id == post_id)
+        )
+        return result.first()
+
+    async def _mutation_error(self, post_id: UUID, action: str) -> HTTPException:
+        # Only reached when an ownership-scoped UPDATE/DELETE matched nothing.
+        if await self.get_post_owner(post_id) is None:
+            return HTTPException(status_code=404, detail="Post not found")
+        return HTTPException(
+            status_code=403, detail=f"You are not allowed to {action} this post."
+        )
     
-    async def is_author_or_admin(self, post: Post) -> bool:
+    async def is_author_or_admin(self, post) -> bool:
         return self.user.id == post.user_id or self.user.type == "admin"
-  
\ No newline at end of file
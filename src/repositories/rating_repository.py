@@ -1,44 +1,187 @@
-from uuid import UUID
+from uuid import UUID, uuid4
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.future import select
-from sqlalchemy.sql import func
+from sqlalchemy import Float, Integer, SmallInteger, Uuid, case, cast, column, func, literal, update, values
 from fastapi import HTTPException
-from src.entity.models import Post, PostRating, User
+from src.entity.models import Post, PostRating, PostRatingStats, User
+from src.services.cache import post_cache, search_cache
+from src.services.rating_aggregator import RatingDeltas, rating_aggregator
+
+STARS = range(1, 6)
+STAR_COUNT_COLUMNS = [f"star_{star}_count" for star in STARS]
 
 async def add_rating(post_id: UUID, rating: int, db: AsyncSession, current_user: User) -> PostRating:
-    # Check if the post exists
-    result = await db.execute(select(Post).filter(Post.id == post_id))
-    post = result.scalars().first()
-    if not post:
-        raise HTTPException(status_code=404, detail="Пост не знайдено")
-    
-    # Prevent user from rating their own post
-    if post.user_id == current_user.id:
-        raise HTTPException(status_code=403, detail="Ви не можете оцінювати власні пости")
-    
-    # Check if the user already rated this post
-    result = await db.execute(select(PostRating).filter(PostRating.post_id == post_id, PostRating.user_id == current_user.id))
-    existing_rating = result.scalars().first()
-    if existing_rating:
-        raise HTTPException(status_code=400, detail="Ви вже оцінили даний пост")
-    
-    # Add new rating
-    new_rating = PostRating(post_id=post_id, user_id=current_user.id, rating=rating)
-    db.add(new_rating)
+    # The rating is written by one statement; it inserts nothing when the post
+    # is missing, is the caller's own, or was already rated by the caller.
+    # With the aggregator running its stats delta is buffered for the next
+    # batch, otherwise the same statement updates the aggregates too.
+    rating_id = uuid4()
+    batched = rating_aggregator.running
+    if batched:
+        stmt = rating_insert(rating_id, post_id, current_user.id, rating)
+    else:
+        stmt = rating_write(rating_id, post_id, current_user.id, rating)
+
+    result = await db.execute(stmt)
+    if result.first() is None:
+        raise await _rating_error(post_id, current_user.id, db)
+
     await db.commit()
-    await db.refresh(new_rating)
-    return new_rating
+    if not batched:
+        post_cache.invalidate(post_id)
+        search_cache.clear()
+    elif not rating_aggregator.add(post_id, rating):
+        # The aggregator stopped while the insert was in flight; its final
+        # flush has already run, so the stats are written here.
+        counts = [0] * len(STARS)
+        counts[rating - 1] = 1
+        await apply_rating_deltas(db, {post_id: tuple(counts)})
+    return PostRating(id=rating_id, post_id=post_id, user_id=current_user.id, rating=rating)
+
+async def _rating_error(post_id: UUID, user_id: UUID, db: AsyncSession) -> HTTPException:
+    # Only reached when the rating insert matched nothing.
+    result = await db.execute(select(Post.user_id).filter(Post.id == post_id))
+    owner = result.first()
+    if owner is None:
+        return HTTPException(status_code=404, detail="Пост не знайдено")
+    if owner.user_id == user_id:
+        return HTTPException(status_code=403, detail="Ви не можете оцінювати власні пости")
+    return HTTPException(status_code=400, detail="Ви вже оцінили даний пост")
+
+def rating_stats_upsert(deltas):
+    """Fold ``deltas`` rows into post_rating_stats.
+
+    The rows are (post_id, rating_sum, rating_count, star_1_count ...
+    star_5_count): the new ratings' sum, their number and their number per
+    star value.
+    """
+    stmt = insert(PostRatingStats).from_select(
+        ["post_id", "rating_sum", "rating_count", "avg_rating", *STAR_COUNT_COLUMNS],
+        select(
+            deltas.c.post_id,
+            deltas.c.rating_sum,
+            deltas.c.rating_count,
+            cast(deltas.c.rating_sum, Float) / deltas.c.rating_count,
+            *(deltas.c[name] for name in STAR_COUNT_COLUMNS),
+        ),
+    )
+    rating_sum = PostRatingStats.rating_sum + stmt.excluded.rating_sum
+    rating_count = PostRatingStats.rating_count + stmt.excluded.rating_count
+    return stmt.on_conflict_do_update(
+        index_elements=[PostRatingStats.post_id],
+        set_={
+            "rating_sum": rating_sum,
+            "rating_count": rating_count,
+            "avg_rating": cast(rating_sum, Float) / rating_count,
+            **{
+                name: getattr(PostRatingStats, name) + stmt.excluded[name]
+                for name in STAR_COUNT_COLUMNS
+            },
+        },
+    )
+
+def star_bucket(avg_rating):
+    """Whole stars of an average rating: the value posts.star_bucket stores."""
+    return cast(func.floor(avg_rating), SmallInteger)
+
+def rating_stats_write(deltas):
+    # The stats upsert runs as a CTE and its new averages set the posts'
+    # star buckets. Posts whose bucket stays the same are not updated: the
+    # column is indexed, so every posts update would rewrite the row and all
+    # its index entries, and take the post's row lock. The statement returns
+    # the ids of the posts whose stats were written.
+    stats = rating_stats_upsert(deltas).returning(
+        PostRatingStats.post_id, PostRatingStats.avg_rating
+    ).cte("stats")
+    buckets = (
+        update(Post)
+        .where(
+            Post.id == stats.c.post_id,
+            Post.star_bucket.is_distinct_from(star_bucket(stats.c.avg_rating)),
+        )
+        .values(star_bucket=star_bucket(stats.c.avg_rating))
+        .cte("buckets")
+    )
+    return select(stats.c.post_id).add_cte(buckets)
+
+def rating_insert(rating_id: UUID, post_id: UUID, user_id: UUID, rating: int):
+    # The author check is part of the SELECT feeding the insert, and the
+    # unique (post_id, user_id) index turns a repeated or concurrent second
+    # rating into DO NOTHING; either way nothing is returned.
+    candidate = select(
+        literal(rating_id, Uuid), literal(user_id, Uuid), Post.id, literal(rating, Integer)
+    ).where(Post.id == post_id, Post.user_id != user_id)
+    return (
+        insert(PostRating)
+        .from_select(["id", "user_id", "post_id", "rating"], candidate)
+        .on_conflict_do_nothing(index_elements=[PostRating.post_id, PostRating.user_id])
+        .returning(PostRating.post_id, PostRating.rating)
+    )
+
+def rating_write(rating_id: UUID, post_id: UUID, user_id: UUID, rating: int):
+    """rating_insert plus its stats upsert and star bucket update, in one statement."""
+    inserted = rating_insert(rating_id, post_id, user_id, rating).cte("inserted")
+    deltas = select(
+        inserted.c.post_id,
+        inserted.c.rating.label("rating_sum"),
+        literal(1, Integer).label("rating_count"),
+        *(
+            case((inserted.c.rating == star, 1), else_=0).label(name)
+            for star, name in zip(STARS, STAR_COUNT_COLUMNS)
+        ),
+    ).subquery("deltas")
+    return rating_stats_write(deltas)
+
+async def apply_rating_deltas(db: AsyncSession, deltas: RatingDeltas) -> None:
+    """Write a batch of buffered per-star rating counts from the rating aggregator."""
+    # Sorted by post, so concurrent batches from several workers lock the
+    # stats rows in the same order.
+    rows = values(
+        column("post_id", Uuid),
+        column("rating_sum", Integer),
+        column("rating_count", Integer),
+        *(column(name, Integer) for name in STAR_COUNT_COLUMNS),
+        name="deltas",
+    ).data([
+        (
+            post_id,
+            sum(star * count for star, count in zip(STARS, deltas[post_id])),
+            sum(deltas[post_id]),
+            *deltas[post_id],
+        )
+        for post_id in sorted(deltas)
+    ])
+    await db.execute(rating_stats_write(rows))
+    await db.commit()
+    for post_id in deltas:
+        post_cache.invalidate(post_id)
+    search_cache.clear()
 
 async def get_rating_data(post_id: UUID, db: AsyncSession):
-    # Check if the post exists
-    result = await db.execute(select(Post).filter(Post.id == post_id))
-    post = result.scalars().first()
-    if not post:
+    # Read the post and its precomputed aggregates in one lookup
+    result = await db.execute(
+        select(Post.id, PostRatingStats.avg_rating, PostRatingStats.rating_count)
+        .outerjoin(PostRatingStats, PostRatingStats.post_id == Post.id)
+        .filter(Post.id == post_id)
+    )
+    rating_data = result.first()
+    if not rating_data:
         raise HTTPException(status_code=404, detail="Пост не знайдено")
     
-    # Get average rating and total number of ratings
-    result = await db.execute(select(func.avg(PostRating.rating), func.count(PostRating.id)).filter(PostRating.post_id == post_id))
-    rating_data = result.first()
-    average_rating = round(rating_data[0], 1) if rating_data[0] else 0
-    total_reviews = rating_data[1]
-    return average_rating, total_reviews
\ No newline at end of file
+    average_rating = round(rating_data[1], 1) if rating_data[1] else 0
+    total_reviews = rating_data[2] or 0
+    return average_rating, total_reviews
+
+async def get_rating_histogram(post_id: UUID, db: AsyncSession) -> list[int]:
+    """Number of 1..5 star ratings of a post, read from its single stats row."""
+    result = await db.execute(
+        select(Post.id, *(getattr(PostRatingStats, name) for name in STAR_COUNT_COLUMNS))
+        .outerjoin(PostRatingStats, PostRatingStats.post_id == Post.id)
+        .filter(Post.id == post_id)
+    )
+    histogram_data = result.first()
+    if not histogram_data:
+        raise HTTPException(status_code=404, detail="Пост не знайдено")
+
+    return [count or 0 for count in histogram_data[1:]]
@@ -0,0 +1,78 @@
+"""Compiles search requests into WHERE clauses the planner can use indexes for.
+
+Every predicate compares a bare column with constants: dates become
+half-open ``[start, end)`` timestamp ranges instead of ``CAST(col AS DATE)``
+and star ratings the precomputed star bucket, so each one can become an index
+condition on its table. Clauses are returned grouped per table so callers
+apply the posts (or users) filters first and join the other tables after.
+"""
+from datetime import date, datetime, time, timedelta
+from typing import Optional
+
+from sqlalchemy import or_, select
+from sqlalchemy.sql.elements import ColumnElement
+
+from src.entity.models import Post, PostTag, Tag, User
+from src.schemas.admin_search import UserSearchRequest
+from src.schemas.search_filter import PostSearchRequest
+
+
+def day_range(column, day: date) -> list[ColumnElement]:
+    start = datetime.combine(day, time.min)
+    return [column >= start, column < start + timedelta(days=1)]
+
+
+def timestamp_range(
+    column, from_date: Optional[datetime], to_date: Optional[datetime]
+) -> list[ColumnElement]:
+    """The search endpoints' date filter as a half-open range on ``column``.
+
+    With both bounds the range runs from ``from_date`` up to a day after
+    ``to_date``; with only one of them it covers that single calendar day.
+    """
+    if from_date and to_date:
+        return [column >= from_date, column < to_date + timedelta(days=1)]
+    if from_date or to_date:
+        return day_range(column, (from_date or to_date).date())
+    return []
+
+
+def star_range(exact_star: Optional[float]) -> list[ColumnElement]:
+    # posts.star_bucket is floor(avg_rating), so bucket n is the half-open
+    # average range [n, n + 1) and bucket 5 is exactly 5.0.
+    if exact_star is None:
+        return []
+    return [Post.star_bucket == int(exact_star)]
+
+
+def compile_post_filters(filters: PostSearchRequest, match) -> list[ColumnElement]:
+    """Filters on ``posts`` itself: keyword, tags, star bucket and creation date."""
+    clauses = []
+    if match is not None:
+        clauses.append(match.condition)
+    if filters.tags:
+        # Fragment lookup on the small tags table (trigram index), then the
+        # links by exact tag name.
+        matching_tags = select(Tag.name).where(Tag.name.ilike(f"%{filters.tags}%"))
+        clauses.append(Post.tags.any(PostTag.tag_name.in_(matching_tags)))
+    clauses.extend(star_range(filters.exact_star))
+    clauses.extend(timestamp_range(Post.created_at, filters.from_date, filters.to_date))
+    return clauses
+
+
+def compile_user_filters(
+    filters: UserSearchRequest, include_inactive: bool = False
+) -> list[ColumnElement]:
+    clauses = []
+    words = [word.strip() for word in (filters.search or "").split(',') if word.strip()]
+    if words:
+        clauses.append(or_(*(
+            or_(User.name.ilike(f"%{word}%"), User.email.ilike(f"%{word}%"))
+            for word in words
+        )))
+    if filters.role:
+        clauses.append(User.type == filters.role)
+    if not include_inactive:
+        clauses.append(User.is_active == True)
+    clauses.extend(timestamp_range(User.created_at, filters.reg_date_from, filters.reg_date_to))
+    return clauses
@@ -1,92 +1,106 @@
-from datetime import timedelta
+from datetime import datetime
+from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import joinedload, selectinload
 from sqlalchemy import func, asc, desc
-from src.entity.models import Post, PostTag, PostRating, User
-from src.schemas.search_filter import PostSearchRequest, PostResponse, TagResponse, UserSearchResponse
-from typing import List
-from sqlalchemy import select, asc, desc, func, or_, and_, cast, Date
-from src.repositories.rating_repository import get_rating_data
+from src.entity.models import Post, PostTag, PostRatingStats, User
+from src.schemas.search_filter import (
+    PostSearchPage, PostSearchRequest, PostResponse, SearchFacets, StarFacet, TagFacet,
+    TagResponse, UserSearchResponse
+)
+from typing import AsyncIterator, List, Optional
+from sqlalchemy import (
+    select, asc, desc, func, cast, literal, tuple_, union_all, String
+)
+from src.core.pagination import decode_cursor, encode_cursor
+from src.core.streaming import STREAM_BATCH_SIZE
+from src.database.explain import Explain, plan_of
+from src.repositories.search_compiler import compile_post_filters
+from src.services.search_backend import search_backend
 
-async def search_posts(
-    filters: PostSearchRequest,
-    db: AsyncSession
-) -> List[PostResponse]:
+SEARCH_POST_COLUMNS = ("id", "title", "description", "image_url", "location", "created_at")
+# Past this many matches counting exactly costs more than it is worth; the
+# total then comes from the planner's estimate.
+SEARCH_COUNT_LIMIT = 1000
+FACET_TAG_LIMIT = 20
+
+
+def build_search_stmt(filters: PostSearchRequest):
+    # Tags are matched with EXISTS rather than a join, so a post never fans out
+    # into one row per tag and the statement needs no GROUP BY. The filters
+    # on posts come from the search compiler as plain column ranges, ahead of
+    # the joins to users and rating stats.
     stmt = (
         select(Post)
-        .outerjoin(PostTag)
-        .outerjoin(PostRating)
+        .where(*compile_post_filters(filters, search_backend.match(filters.keyword)))
         .join(User, Post.user_id == User.id)
-        .options(joinedload(Post.tags), joinedload(Post.ratings), joinedload(Post.user))
+        .where(User.is_active == True)
+        .outerjoin(PostRatingStats, PostRatingStats.post_id == Post.id)
     )
 
-    filter_clauses = []
-
-    if filters.keyword:
-        words = [word.strip() for word in filters.keyword.split(',') if word.strip()]
-        keyword_conditions = []
-        
-        for word in words:
-            keyword_conditions.append(
-                or_(
-                    Post.title.ilike(f"%{word}%"),
-                    Post.description.ilike(f"%{word}%"),
-                    PostTag.tag_name.ilike(f"%{word}%")
-                )
-            )
+    sort_key, _ = _sort_key(filters)
 
-        filter_clauses.append(or_(*keyword_conditions))
+    if filters.cursor:
+        stmt = stmt.where(_after_cursor(filters, sort_key))
 
-    if filters.tags:
-        filter_clauses.append(PostTag.tag_name.ilike(f"%{filters.tags}%"))
+    # Post.id breaks ties so every row has exactly one place in the order and
+    # keyset pages neither repeat nor skip posts.
+    if filters.order == "asc":
+        stmt = stmt.order_by(asc(sort_key), asc(Post.id))
+    else:
+        stmt = stmt.order_by(desc(sort_key), desc(Post.id))
 
-    if filters.from_date and filters.to_date:
-        to_date = filters.to_date + timedelta(days=1)
-        filter_clauses.append(Post.created_at.between(filters.from_date, to_date))
-    elif filters.from_date:
-        filter_clauses.append(cast(Post.created_at, Date) == filters.from_date.date())
-    elif filters.to_date:
-        filter_clauses.append(cast(Post.created_at, Date) == filters.to_date.date())
+    return stmt
 
-    stmt = stmt.where(User.is_active == True)
 
-    if filter_clauses:
-        stmt = stmt.where(and_(*filter_clauses))
+def _sort_key(filters: PostSearchRequest):
+    """The ORDER BY expression for the requested sort and the type of its cursor value."""
+    if filters.sort_by == "rating":
+        return func.coalesce(PostRatingStats.avg_rating, 0.0), float
 
-    stmt = stmt.group_by(Post.id)
+    match = search_backend.match(filters.keyword)
+    if filters.sort_by == "relevance" and match is not None:
+        return match.rank, float
 
-    if filters.exact_star is not None:
-        rounded_star = int(filters.exact_star)
-    
-        if rounded_star == 5:
-            stmt = stmt.having(func.avg(PostRating.rating) == 5.0)
-        else:
-            lower_bound = float(rounded_star)
-            upper_bound = rounded_star + 0.9
-            stmt = stmt.having(
-                and_(
-                    func.avg(PostRating.rating) >= lower_bound,
-                    func.avg(PostRating.rating) <= upper_bound
-                )
-            )
+    return Post.created_at, datetime
 
-    if filters.sort_by == "rating":
-        stmt = stmt.group_by(Post.id)
-        sort_column = func.coalesce(func.avg(PostRating.rating), 0)
-    else:
-        sort_column = Post.created_at
+
+def _after_cursor(filters: PostSearchRequest, sort_key):
+    _, kind = _sort_key(filters)
+    value, post_id = decode_cursor(filters.cursor, kind, UUID)
 
     if filters.order == "asc":
-        stmt = stmt.order_by(asc(sort_column))
-    else:
-        stmt = stmt.order_by(desc(sort_column))
+        return tuple_(sort_key, Post.id) > tuple_(value, post_id)
+    return tuple_(sort_key, Post.id) < tuple_(value, post_id)
 
-    result = await db.execute(stmt)
-    posts = result.unique().scalars().all()
-    
-    return [
-        PostResponse(
+
+async def count_search_results(filters: PostSearchRequest, db: AsyncSession) -> tuple[int, bool]:
+    """Exact total up to SEARCH_COUNT_LIMIT, the planner's row estimate above it.
+
+    Only PostgreSQL can EXPLAIN the statement; other databases count exactly.
+    """
+    stmt = build_search_stmt(filters.model_copy(update={"cursor": None})).order_by(None)
+    ids = stmt.with_only_columns(Post.id)
+
+    capped = await db.execute(
+        select(func.count()).select_from(ids.limit(SEARCH_COUNT_LIMIT + 1).subquery())
+    )
+    total = capped.scalar_one()
+    if total <= SEARCH_COUNT_LIMIT:
+        return total, False
+
+    if db.get_bind().dialect.name != "postgresql":
+        exact = await db.execute(select(func.count()).select_from(ids.subquery()))
+        return exact.scalar_one(), False
+
+    plan = plan_of((await db.execute(Explain(stmt))).scalar_one())
+    return max(int(plan["Plan Rows"]), total), True
+
+
+def _to_response(post: Post, average_rating, total_reviews, fields=None) -> PostResponse:
+    if fields is None:
+        return PostResponse(
             id=post.id,
             title=post.title,
             description=post.description,
@@ -98,6 +112,174 @@ async def search_posts(
             avg_rating=average_rating,
             rating_count=total_reviews
         )
-        for post in posts
-        for average_rating, total_reviews in [await get_rating_data(post.id, db)]
-    ]
\ No newline at end of file
+
+    values = {name: getattr(post, name) for name in SEARCH_POST_COLUMNS if name in fields}
+    if "user" in fields:
+        values["user"] = UserSearchResponse(id=post.user.id, name=post.user.name, img_link=post.user.img_link)
+    if "tags" in fields:
+        values["tags"] = [TagResponse(name=tag.tag_name) for tag in post.tags]
+    if "avg_rating" in fields:
+        values["avg_rating"] = average_rating
+    if "rating_count" in fields:
+        values["rating_count"] = total_reviews
+    return PostResponse.model_construct(**values)
+
+
+def _wants_ratings(fields) -> bool:
+    return fields is None or "avg_rating" in fields or "rating_count" in fields
+
+
+def _rating_values(average_rating, total_reviews):
+    if not total_reviews:
+        return 0, 0
+    return round(average_rating, 1), total_reviews
+
+
+async def search_facets(
+    filters: PostSearchRequest,
+    db: AsyncSession,
+    facets: frozenset[str]
+) -> SearchFacets:
+    """Facet counts over the whole filtered set, aggregated by the database.
+
+    The matching posts become one CTE of ids and star buckets; each requested
+    facet is a GROUP BY over it, and the facets are UNION ALLed so the counts
+    arrive in a single round trip.
+    """
+    matched = (
+        build_search_stmt(filters.model_copy(update={"cursor": None}))
+        .order_by(None)
+        .with_only_columns(Post.id.label("post_id"), Post.star_bucket.label("stars"))
+        .cte("matched")
+    )
+
+    parts = []
+    if "tags" in facets:
+        parts.append(
+            select(
+                literal("tags").label("facet"),
+                PostTag.tag_name.label("value"),
+                func.count().label("count"),
+            )
+            .select_from(matched.join(PostTag, PostTag.post_id == matched.c.post_id))
+            .group_by(PostTag.tag_name)
+            .order_by(desc("count"), PostTag.tag_name)
+            .limit(FACET_TAG_LIMIT)
+        )
+    if "stars" in facets:
+        parts.append(
+            select(
+                literal("stars").label("facet"),
+                cast(matched.c.stars, String).label("value"),
+                func.count().label("count"),
+            )
+            .group_by(matched.c.stars)
+        )
+
+    # Each branch is wrapped so its own ORDER BY/LIMIT stays inside it.
+    stmt = union_all(*(select(part.subquery()) for part in parts))
+    rows = (await db.execute(stmt)).all()
+
+    result = SearchFacets()
+    if "tags" in facets:
+        result.tags = [
+            TagFacet(name=row.value, count=row.count) for row in rows if row.facet == "tags"
+        ]
+    if "stars" in facets:
+        result.stars = sorted(
+            (
+                StarFacet(stars=None if row.value is None else int(row.value), count=row.count)
+                for row in rows if row.facet == "stars"
+            ),
+            key=lambda facet: -1 if facet.stars is None else facet.stars,
+            reverse=True,
+        )
+    return result
+
+
+async def search_posts(
+    filters: PostSearchRequest,
+    db: AsyncSession,
+    fields: Optional[frozenset[str]] = None,
+    facets: Optional[frozenset[str]] = None
+) -> PostSearchPage:
+    # Authors and tags are only loaded when the response will render them.
+    options = []
+    if fields is None or "tags" in fields:
+        options.append(joinedload(Post.tags))
+    if fields is None or "user" in fields:
+        options.append(joinedload(Post.user))
+
+    # The rating aggregates come from the joined post_rating_stats row, in the
+    # same statement as the posts; the sort key is selected for the cursor.
+    columns = []
+    if _wants_ratings(fields):
+        columns = [PostRatingStats.avg_rating, PostRatingStats.rating_count]
+    sort_key, _ = _sort_key(filters)
+
+    stmt = (
+        build_search_stmt(filters)
+        .options(*options)
+        .add_columns(*columns, sort_key.label("sort_key"))
+        .limit(filters.limit + 1)
+    )
+
+    result = await db.execute(stmt)
+    rows = result.unique().all()
+
+    next_cursor = None
+    if len(rows) > filters.limit:
+        rows = rows[:filters.limit]
+        next_cursor = encode_cursor(rows[-1].sort_key, rows[-1][0].id)
+
+    if next_cursor is None and not filters.cursor:
+        # The whole result fits on the first page: its size is the total.
+        total, total_is_estimate = len(rows), False
+    else:
+        total, total_is_estimate = await count_search_results(filters, db)
+
+    if _wants_ratings(fields):
+        items = [
+            _to_response(post, *_rating_values(average_rating, total_reviews), fields)
+            for post, average_rating, total_reviews, _ in rows
+        ]
+    else:
+        items = [_to_response(post, None, None, fields) for post, _ in rows]
+
+    return PostSearchPage(
+        items=items,
+        next_cursor=next_cursor,
+        total=total,
+        total_is_estimate=total_is_estimate,
+        facets=await search_facets(filters, db, facets) if facets else None,
+    )
+
+
+async def stream_search_posts(
+    filters: PostSearchRequest,
+    db: AsyncSession,
+    fields: Optional[frozenset[str]] = None
+) -> AsyncIterator[PostResponse]:
+    # Joined eager loads of collections cannot be combined with yield_per, so
+    # the streamed variant loads tags, authors and rating aggregates with one
+    # selectin query each per batch of rows.
+    options = []
+    if fields is None or "tags" in fields:
+        options.append(selectinload(Post.tags))
+    if fields is None or "user" in fields:
+        options.append(selectinload(Post.user))
+    if _wants_ratings(fields):
+        options.append(selectinload(Post.rating_stats))
+
+    stmt = build_search_stmt(filters).options(*options).execution_options(
+        yield_per=STREAM_BATCH_SIZE
+    )
+
+    result = await db.stream_scalars(stmt)
+
+    async for post in result:
+        stats = post.rating_stats if _wants_ratings(fields) else None
+        if stats:
+            yield _to_response(post, *_rating_values(stats.avg_rating, stats.rating_count), fields)
+        else:
+            yield _to_response(post, 0, 0, fields)
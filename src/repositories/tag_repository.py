@@ -0,0 +1,18 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, select
+from src.entity.models import PostTag, Tag
+
+
+class TagRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_post_counts(self) -> list[tuple[str, int]]:
+        """Every tag with the number of posts carrying it."""
+        stmt = (
+            select(Tag.name, func.count(PostTag.id))
+            .outerjoin(PostTag, PostTag.tag_name == Tag.name)
+            .group_by(Tag.name)
+        )
+        result = await self.db.execute(stmt)
+        return [(name, count) for name, count in result.all()]
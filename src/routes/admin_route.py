@@ -6,10 +6,12 @@ from uuid import UUID
 from src.database.db import get_db
 from src.core.dependencies import role_required
 from src.core.limiter import limiter
+from src.core.streaming import ndjson_response, wants_ndjson
 from src.schemas.user_schema_for_admin_page import UserResponseForAdminPage
 from src.schemas.comment import CommentOut
 from src.services.admin_user_service import AdminUserService
 from src.services.admin_comment_service import AdminCommentService
+from src.services.cache import post_cache, search_cache
 
 
 router = APIRouter(prefix="/admin", tags=["admin"])
@@ -19,9 +21,13 @@ router = APIRouter(prefix="/admin", tags=["admin"])
 @limiter.limit("80/minute")
 async def admin_get_all_users(
     request: Request,
+    stream: bool = False,
     db: AsyncSession = Depends(get_db), 
     admin=role_required("admin")
 ):
+    if wants_ndjson(request, stream):
+        return ndjson_response(lambda session: AdminUserService(session).admin_stream_users())
+
     return await AdminUserService(db).admin_get_all_users()
 
 
@@ -67,3 +73,12 @@ async def admin_get_post_comments(
     admin=role_required("admin")
 ):
     return await AdminCommentService(db).admin_get_post_comments(post_id)
+
+
+@router.get("/cache/stats", response_model=dict)
+@limiter.limit("60/minute")
+async def admin_cache_stats(
+    request: Request,
+    admin=role_required("admin")
+):
+    return {"posts": post_cache.stats(), "search": search_cache.stats()}
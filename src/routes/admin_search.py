@@ -1,9 +1,8 @@
-from typing import List
 from fastapi import APIRouter, Depends, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from src.database.db import get_db
 from src.repositories import admin_search_repository as users_repo
-from src.schemas.admin_search import UserOut, UserSearchRequest
+from src.schemas.admin_search import UserSearchPage, UserSearchRequest
 from src.entity.models import User
 from src.core.dependencies import role_required
 from src.core.limiter import limiter
@@ -11,7 +10,7 @@ from src.core.limiter import limiter
 router = APIRouter(prefix="/admin/users", tags=["Admin Search"])
 
 
-@router.get("/search", response_model=List[UserOut])
+@router.get("/search", response_model=UserSearchPage)
 @limiter.limit("10/minute")
 async def search_users(
     request: Request,
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, Request
+from fastapi import APIRouter, Depends, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from src.database.db import get_db
 from src.schemas.comment import CommentCreateDTO, CommentOut, CommentUpdateDTO 
@@ -6,6 +6,9 @@ from src.services.comment_service import CommentService
 from src.repositories.comment_repository import CommentRepository
 from uuid import UUID
 from src.entity.models import User
+from src.core.conditional import (
+    is_conditional, is_not_modified, make_etag, not_modified, set_validators
+)
 from src.core.dependencies import role_required
 from src.core.limiter import limiter
 
@@ -30,10 +33,21 @@ async def add_comment(
 async def get_comments(
     post_id: UUID,
     request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_db)
 ):
     service = CommentService(CommentRepository(db))
-    return await service.get_comments_for_post(post_id)
+
+    if is_conditional(request):
+        count, last_modified = await service.get_comments_version(post_id)
+        etag = make_etag(count, last_modified)
+        if is_not_modified(request, etag, last_modified):
+            return not_modified(etag, last_modified)
+
+    comments = await service.get_comments_for_post(post_id)
+    last_modified = max((c.updated_at for c in comments), default=None)
+    set_validators(response, make_etag(len(comments), last_modified), last_modified)
+    return comments
 
 
 @router.get("/comments/{comment_id}", response_model=CommentOut)
@@ -1,54 +1,121 @@
 from fastapi import (
-    APIRouter, Body, Depends, File, Form, HTTPException, Request, status, UploadFile 
+    APIRouter, Body, Depends, File, Form, HTTPException, Query, Request, Response, status, UploadFile 
 )
+from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from src.schemas.post import (
-    PostResponse, PostCreateModel, PostCreateResponse, PostUpdateRequest
+    PostBatchRequest, PostBatchResponse, PostBulkCreateRequest, PostResponse, PostCreateModel,
+    PostCreateResponse, PostPage, PostUpdateRequest
 )
 from uuid import UUID
 from src.database.db import get_db
 from src.repositories.post_repository import PostRepository
 from src.services.cloudinary_qr_service import UploadFileService, QrService
 from src.services.post_service import PostService
-from typing import List
+from typing import List, Optional
 from src.entity.models import User
+from src.core.conditional import (
+    is_conditional, is_not_modified, make_etag, not_modified, set_validators
+)
 from src.core.dependencies import role_required
+from src.core.fieldsets import parse_fields
 from src.core.limiter import limiter
+from src.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from src.core.streaming import ndjson_response, wants_ndjson
 
 router = APIRouter(prefix='/posts', tags=['posts'])
 
-@router.get("/", response_model=List[PostResponse])
+def sparse_page(page: PostPage, fields: frozenset[str]) -> JSONResponse:
+    return JSONResponse(
+        page.model_dump(mode="json", include={"items": {"__all__": fields}, "next_cursor": True})
+    )
+
+@router.get("/", response_model=PostPage)
 @limiter.limit("10/minute")
 async def get_posts(
     request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    stream: bool = False,
+    fields: Optional[str] = None,
     db: AsyncSession = Depends(get_db), 
 ):
+    fieldset = parse_fields(fields, PostResponse)
+
+    if wants_ndjson(request, stream):
+        return ndjson_response(
+            lambda session: PostService(PostRepository(session)).stream_all_posts(cursor, fieldset),
+            include=fieldset,
+        )
+
     service = PostService(PostRepository(db))
+    page = await service.get_all_posts(limit, cursor, fieldset)
+
+    if fieldset:
+        return sparse_page(page, fieldset)
     
-    return await service.get_all_posts()
+    return page
+
+@router.post("/batch", response_model=PostBatchResponse)
+@limiter.limit("30/minute")
+async def get_posts_batch(
+    request: Request,
+    batch: PostBatchRequest = Body(...),
+    db: AsyncSession = Depends(get_db)
+):
+    service = PostService(PostRepository(db))
+
+    return await service.get_posts_by_ids(batch.ids)
 
 @router.get("/{post_id}", response_model=PostResponse)
 @limiter.limit("10/minute")
 async def get_post(
     post_id: UUID, 
     request: Request,
+    response: Response,
+    fields: Optional[str] = None,
     db: AsyncSession = Depends(get_db)
 ):
+    fieldset = parse_fields(fields, PostResponse)
     service = PostService(PostRepository(db))
+
+    # Each fieldset is its own representation, so it is part of the tag.
+    if is_conditional(request):
+        etag = make_etag(*await service.get_post_version(post_id), *sorted(fieldset or ()))
+        if is_not_modified(request, etag):
+            return not_modified(etag)
+
+    post = await service.get_post_by_id(post_id, fieldset)
+    etag = make_etag(*post.version, *sorted(fieldset or ()))
+
+    if fieldset:
+        return set_validators(
+            JSONResponse(post.model_dump(mode="json", include=fieldset)), etag
+        )
+
+    set_validators(response, etag)
     
-    return await service.get_post_by_id(post_id)
+    return post
 
-@router.get("/user/{user_id}", response_model=List[PostResponse])
+@router.get("/user/{user_id}", response_model=PostPage)
 @limiter.limit("10/minute")
 async def get_posts_by_user(
     request: Request,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
     db: AsyncSession = Depends(get_db), 
     current_user: User = role_required("user", "admin"),
     user_id: UUID = None
 ):
+    fieldset = parse_fields(fields, PostResponse)
     service = PostService(PostRepository(db, current_user, user_id))
+    page = await service.get_all_user_posts(limit, cursor, fieldset)
+
+    if fieldset:
+        return sparse_page(page, fieldset)
     
-    return await service.get_all_user_posts()
+    return page
 
 @router.put("/{post_id}", response_model=PostResponse)
 @limiter.limit("3/minute")
@@ -59,21 +126,7 @@ async def update_post(
     current_user: User = role_required("user"),
 ):
     service = PostService(PostRepository(db, current_user))
-    post = await service.get_post_by_id(post_id)
-
-    if post is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Post not found")
-    
-    author_or_admin = await service.is_author_or_admin(post)
 
-    if not author_or_admin:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You are not allowed to update this post.",
-        )
-    
-    if not await service.update_post(post_id, update_data.description):
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Post not found")
     return await service.update_post(post_id, update_data.description)
 
 @router.post("/", response_model=PostCreateResponse)
@@ -87,6 +140,17 @@ async def create_post(
     service = PostService(PostRepository(db, current_user))
     return await service.create_post(post_data)
 
+@router.post("/bulk", response_model=List[PostCreateResponse])
+@limiter.limit("3/minute")
+async def create_posts_bulk(
+    request: Request,
+    bulk: PostBulkCreateRequest = Body(...),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = role_required("user", "admin")):
+
+    service = PostService(PostRepository(db, current_user))
+    return await service.create_posts(bulk.posts)
+
 @router.delete("/{post_id}", response_model=bool)
 @limiter.limit("3/minute")
 async def delete_post(
@@ -96,26 +160,8 @@ async def delete_post(
     current_user: User = role_required("user", "admin"),
 ):
     service = PostService(PostRepository(db, current_user))
-    post = await service.get_post_by_id(post_id)
-
-    if post is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Post not found")
-
-    author_or_admin = await service.is_author_or_admin(post)
 
-    if not author_or_admin:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You are not allowed to delete this post.",
-        )
-
-    if not await service.delete_post(post_id):
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, 
-            detail="Post not found"
-        )
-    
-    return True
+    return await service.delete_post(post_id)
 
 @router.post("/upload-filtered-image/")
 @limiter.limit("3/minute")
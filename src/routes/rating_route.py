@@ -1,14 +1,15 @@
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.sql import func, select
 from pydantic import BaseModel, Field
 from src.database.db import get_db
 from src.entity.models import User, Post, PostRating
-from src.repositories.rating_repository import add_rating, get_rating_data
-from src.schemas.rating import RatingCreate, RatingOut
+from src.repositories.rating_repository import add_rating, get_rating_data, get_rating_histogram
+from src.schemas.rating import RatingCreate, RatingHistogram, RatingOut, RatingSummary, StarCount
 from src.routes.auth import get_current_user
+from src.core.conditional import is_not_modified, make_etag, not_modified, set_validators
 from src.core.limiter import limiter
 
 
@@ -27,9 +28,34 @@ async def rate_post(
     return await add_rating(post_id, rating_data.rating, db, current_user)
 
 
-@router.get("/posts/{post_id}/rating", response_model=RatingOut)
+@router.get("/posts/{post_id}/rating", response_model=RatingSummary)
 @limiter.limit("100/minute")
 async def get_post_rating(
-    post_id: UUID, request: Request, db: AsyncSession = Depends(get_db)
+    post_id: UUID, request: Request, response: Response, db: AsyncSession = Depends(get_db)
 ):
-    return await get_rating_data(post_id, db)
+    average_rating, total_reviews = await get_rating_data(post_id, db)
+
+    etag = make_etag(average_rating, total_reviews)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+
+    set_validators(response, etag)
+    return RatingSummary(average_rating=average_rating, total_reviews=total_reviews)
+
+
+@router.get("/posts/{post_id}/histogram", response_model=RatingHistogram)
+@limiter.limit("100/minute")
+async def get_post_rating_histogram(
+    post_id: UUID, request: Request, response: Response, db: AsyncSession = Depends(get_db)
+):
+    counts = await get_rating_histogram(post_id, db)
+
+    etag = make_etag(*counts)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+
+    set_validators(response, etag)
+    return RatingHistogram(
+        total_reviews=sum(counts),
+        counts=[StarCount(stars=stars, count=count) for stars, count in enumerate(counts, start=1)],
+    )
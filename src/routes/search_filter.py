@@ -1,20 +1,49 @@
 from fastapi import APIRouter, Depends, Request
+from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from src.database.db import get_db
-from src.repositories.search_filter import search_posts
-from src.schemas.search_filter import PostSearchRequest, PostResponse
-from typing import List, Optional
+from src.core.fieldsets import parse_fields
+from src.core.streaming import ndjson_response, wants_ndjson
+from src.repositories.search_filter import stream_search_posts
+from src.schemas.search_filter import PostSearchPage, PostSearchRequest, PostResponse, SearchFacets
+from typing import Optional
 from src.core.limiter import limiter
+from src.services.search_service import SearchService
 
 
 router = APIRouter(prefix="/posts", tags=["Post Search"])
 
 
-@router.get("/search", response_model=List[PostResponse])
+@router.get("/search", response_model=PostSearchPage)
 @limiter.limit("10/minute")
 async def search_posts_with_filters(
     request: Request,
     filters: PostSearchRequest = Depends(),
+    stream: bool = False,
+    fields: Optional[str] = None,
+    facets: Optional[str] = None,
     db: AsyncSession = Depends(get_db),
 ):
-    return await search_posts(filters, db)
+    fieldset = parse_fields(fields, PostResponse)
+    facet_names = parse_fields(facets, SearchFacets, label="facets")
+
+    if wants_ndjson(request, stream):
+        return ndjson_response(
+            lambda session: stream_search_posts(filters, session, fieldset),
+            include=fieldset,
+        )
+
+    page = await SearchService(db).search_posts(filters, fieldset, facet_names)
+
+    if fieldset:
+        return JSONResponse(
+            page.model_dump(mode="json", include={
+                "items": {"__all__": fieldset},
+                "next_cursor": True,
+                "total": True,
+                "total_is_estimate": True,
+                "facets": True,
+            })
+        )
+
+    return page
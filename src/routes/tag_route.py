@@ -0,0 +1,22 @@
+from fastapi import APIRouter, Query, Request
+from typing import List
+from src.core.limiter import limiter
+from src.schemas.post import TagSuggestion
+from src.services.tag_index import tag_index
+
+
+router = APIRouter(prefix="/tags", tags=["tags"])
+
+
+@router.get("/suggest", response_model=List[TagSuggestion])
+@limiter.limit("300/minute")
+async def suggest_tags(
+    request: Request,
+    prefix: str = Query(..., min_length=1, max_length=50),
+    limit: int = Query(10, ge=1, le=50),
+):
+    # Answered from the in-process index; no database session is opened.
+    return [
+        TagSuggestion(name=name, post_count=count)
+        for name, count in tag_index.suggest(prefix, limit)
+    ]
@@ -1,8 +1,9 @@
-from pydantic import BaseModel, ConfigDict, EmailStr
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
 from datetime import datetime
 from uuid import UUID
 from enum import Enum
-from typing import Optional, Literal
+from typing import List, Optional, Literal
+from src.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 
 class UserRole(str, Enum):
     user = "user"
@@ -31,4 +32,11 @@ class UserSearchRequest(BaseModel):
     reg_date_from: Optional[datetime] = None
     reg_date_to: Optional[datetime] = None
     sort_by: Literal["name", "registration_date"] = "name"
-    sort_order: Literal["asc", "desc"] = "asc"
\ No newline at end of file
+    sort_order: Literal["asc", "desc"] = "asc"
+    limit: int = Field(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)
+    cursor: Optional[str] = None
+
+
+class UserSearchPage(BaseModel):
+    items: List[UserOut]
+    next_cursor: Optional[str] = None
@@ -1,5 +1,5 @@
 from datetime import datetime
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, PrivateAttr
 from pydantic.config import ConfigDict
 from typing import List, Optional
 from uuid import UUID
@@ -14,6 +14,10 @@ class TagsShortResponse(BaseModel):
 
     model_config = ConfigDict(from_attributes=True)
 
+class TagSuggestion(BaseModel):
+    name: str
+    post_count: int
+
 class UserShortResponse(BaseModel):
     id: UUID
     name: Optional[str]
@@ -40,6 +44,11 @@ class PostCreateModel(BaseModel):
 
     model_config = ConfigDict(from_attributes=True)
 
+MAX_BULK_CREATE_SIZE = 100
+
+class PostBulkCreateRequest(BaseModel):
+    posts: List[PostCreateModel] = Field(min_length=1, max_length=MAX_BULK_CREATE_SIZE)
+
 class PostResponse(BaseModel):
     id: UUID
     title: str
@@ -54,8 +63,30 @@ class PostResponse(BaseModel):
     user: Optional[UserShortResponse] = None
     tags: List[TagsShortResponse] = []
 
+    # (updated_at, rating_count, author's updated_at): what the post's ETag is
+    # made from. The author's version is part of it because the response
+    # embeds their name and avatar. Never rendered.
+    _version: Optional[tuple] = PrivateAttr(default=None)
+
     model_config = ConfigDict(from_attributes=True)
 
+    @property
+    def version(self) -> Optional[tuple]:
+        return self._version
+
+class PostPage(BaseModel):
+    items: List[PostResponse]
+    next_cursor: Optional[str] = None
+
+MAX_BATCH_SIZE = 200
+
+class PostBatchRequest(BaseModel):
+    ids: List[UUID] = Field(min_length=1, max_length=MAX_BATCH_SIZE)
+
+class PostBatchResponse(BaseModel):
+    items: List[PostResponse]
+    missing: List[UUID] = []
+
 class PostCreateResponse(BaseModel):
     id: UUID
     image_url: str
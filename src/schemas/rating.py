@@ -1,4 +1,5 @@
 from pydantic import BaseModel, UUID4, ConfigDict, Field
+from typing import List
 from datetime import datetime
 
 
@@ -13,4 +14,19 @@ class RatingOut(BaseModel):
     post_id: UUID4
     rating: int = Field(ge=1, le=5)
 
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+class RatingSummary(BaseModel):
+    average_rating: float
+    total_reviews: int
+
+
+class StarCount(BaseModel):
+    stars: int = Field(ge=1, le=5)
+    count: int
+
+
+class RatingHistogram(BaseModel):
+    total_reviews: int
+    # One entry per star value, 1 to 5, including the ones nobody gave.
+    counts: List[StarCount]
@@ -1,16 +1,28 @@
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 from uuid import UUID
 from typing import List, Dict, Optional, Literal
 from datetime import datetime
+from src.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 
 class PostSearchRequest(BaseModel):
     keyword: Optional[str] = None
     tags: Optional[str] = None
     from_date: Optional[datetime] = None
     to_date: Optional[datetime] = None
-    sort_by: Literal["date", "rating"] = "date"
+    sort_by: Literal["date", "rating", "relevance"] = "date"
     order: Literal["asc", "desc"] = "desc"
     exact_star: Optional[float] = None
+    limit: int = Field(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)
+    cursor: Optional[str] = None
+
+    @field_validator("tags")
+    @classmethod
+    def _normalize_tags(cls, value: Optional[str]) -> Optional[str]:
+        # The fragment is matched as given, so surrounding spaces would change
+        # the result; a blank one means no tag filter.
+        if value is None:
+            return None
+        return value.strip() or None
 
 
 class UserSearchResponse(BaseModel):
@@ -37,4 +49,28 @@ class PostResponse(BaseModel):
     avg_rating: Optional[float] = None
     rating_count: Optional[int] = None
 
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+
+class TagFacet(BaseModel):
+    name: str
+    count: int
+
+
+class StarFacet(BaseModel):
+    # Whole stars of the average rating (4 covers 4.0-4.9); None for unrated posts.
+    stars: Optional[int] = None
+    count: int
+
+
+class SearchFacets(BaseModel):
+    tags: Optional[List[TagFacet]] = None
+    stars: Optional[List[StarFacet]] = None
+
+
+class PostSearchPage(BaseModel):
+    items: List[PostResponse]
+    next_cursor: Optional[str] = None
+    total: int
+    total_is_estimate: bool = False
+    facets: Optional[SearchFacets] = None
@@ -1,6 +1,8 @@
+from datetime import datetime
 from fastapi import HTTPException
 from uuid import UUID
 from src.repositories.admin_comment_repository import AdminCommentRepository
+from src.services.cache import post_cache
 
 class AdminCommentService:
     def __init__(self, db):
@@ -12,7 +14,9 @@ class AdminCommentService:
             raise HTTPException(status_code=404, detail="Comment not found")
 
         comment.is_deleted = True
+        comment.updated_at = datetime.utcnow()
         await self.repo.admin_commit()
+        post_cache.invalidate(comment.post_id)
         return {"message": "Comment marked as deleted"}
 
     async def admin_get_post_comments(self, post_id: UUID):
@@ -3,6 +3,7 @@ from uuid import UUID
 from src.entity.models import UserTypeEnum
 from src.repositories.admin_user_repository import AdminUserRepository
 from src.schemas.user_schema_for_admin_page import UserResponseForAdminPage
+from src.services.cache import search_cache
 
 class AdminUserService:
     def __init__(self, db):
@@ -12,6 +13,10 @@ class AdminUserService:
         users = await self.repo.admin_get_all_users()
         return [UserResponseForAdminPage.model_validate(u) for u in users]
 
+    async def admin_stream_users(self):
+        async for user in self.repo.admin_stream_users():
+            yield UserResponseForAdminPage.model_validate(user)
+
     async def admin_ban_user(self, user_id: UUID, admin):
         user = await self.repo.admin_get_user_by_id(user_id)
         if not user:
@@ -22,6 +27,8 @@ class AdminUserService:
 
         user.is_active = not user.is_active
         await self.repo.admin_commit_and_refresh(user)
+        # Search hides posts of inactive authors.
+        search_cache.clear()
 
         action = "unbanned" if user.is_active else "banned"
         return {"message": f"User {user.email} has been {action} successfully"}
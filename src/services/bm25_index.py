@@ -0,0 +1,182 @@
+import heapq
+import math
+import re
+from array import array
+from collections import Counter
+from operator import itemgetter
+from typing import Hashable, Iterable, Optional
+
+TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text: Optional[str]) -> list[str]:
+    return TOKEN_RE.findall(text.lower()) if text else []
+
+
+class BM25Index:
+    """In-process inverted index with Okapi BM25 ranking.
+
+    Documents get consecutive ordinals. Each term's postings are two parallel
+    ``array`` columns (ordinals and term frequencies): 8 bytes per posting
+    rather than a tuple of two ints, about 24 MiB for 100k posts of ~40 words.
+    Ordinals only grow, so postings stay sorted by appending. Removing a
+    document only marks its ordinal dead; once dead ordinals outnumber live
+    ones the postings are rebuilt without them.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._clear()
+
+    def _clear(self) -> None:
+        self._doc_ids: list[Optional[Hashable]] = []
+        self._ordinals: dict[Hashable, int] = {}
+        self._lengths = array("I")
+        self._postings: dict[str, tuple[array, array]] = {}
+        self._total_length = 0
+        self._dead = 0
+        self._norms: Optional[array] = None
+
+    def __len__(self) -> int:
+        return len(self._ordinals)
+
+    def add(self, doc_id: Hashable, text: str) -> None:
+        """Index ``text`` under ``doc_id``, replacing any previous version."""
+        self.remove(doc_id)
+
+        tokens = tokenize(text)
+        ordinal = len(self._doc_ids)
+        self._doc_ids.append(doc_id)
+        self._ordinals[doc_id] = ordinal
+        self._lengths.append(len(tokens))
+        self._total_length += len(tokens)
+        self._norms = None
+
+        for term, frequency in Counter(tokens).items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = (array("I"), array("I"))
+            postings[0].append(ordinal)
+            postings[1].append(frequency)
+
+    def remove(self, doc_id: Hashable) -> None:
+        ordinal = self._ordinals.pop(doc_id, None)
+        if ordinal is None:
+            return
+        self._doc_ids[ordinal] = None
+        self._total_length -= self._lengths[ordinal]
+        self._dead += 1
+        self._norms = None
+        if self._dead > len(self._ordinals):
+            self._compact()
+
+    def search(self, terms: Iterable[str], limit: int) -> list[tuple[Hashable, float]]:
+        """The ``limit`` best documents for any of ``terms``, best first."""
+        if not self._ordinals:
+            return []
+        scores = self._scores(terms)
+        best = heapq.nlargest(limit, scores.items(), key=itemgetter(1))
+        return [(self._doc_ids[ordinal], score) for ordinal, score in best]
+
+    def match(
+        self, groups: Iterable[Iterable[str]], limit: int
+    ) -> tuple[list[tuple[Hashable, float]], list[Hashable]]:
+        """Documents containing every term of at least one of ``groups``.
+
+        Returns the ``limit`` best of them by BM25 over all the terms, best
+        first, and the ids of all of them in no particular order.
+        """
+        groups = [list(dict.fromkeys(group)) for group in groups]
+        groups = [group for group in groups if group]
+        if not self._ordinals or not groups:
+            return [], []
+
+        matched: set[int] = set()
+        for group in groups:
+            postings = [self._postings.get(term) for term in group]
+            if any(p is None for p in postings):
+                continue
+            # Intersect starting from the rarest term.
+            postings.sort(key=lambda p: len(p[0]))
+            ordinals = set(postings[0][0])
+            for other in postings[1:]:
+                ordinals.intersection_update(other[0])
+                if not ordinals:
+                    break
+            matched |= ordinals
+
+        doc_ids = self._doc_ids
+        matched = {ordinal for ordinal in matched if doc_ids[ordinal] is not None}
+        if not matched:
+            return [], []
+
+        scores = self._scores(term for group in groups for term in group)
+        best = heapq.nlargest(limit, ((o, scores[o]) for o in matched), key=itemgetter(1))
+        return (
+            [(doc_ids[ordinal], score) for ordinal, score in best],
+            [doc_ids[ordinal] for ordinal in matched],
+        )
+
+    def _scores(self, terms: Iterable[str]) -> dict[int, float]:
+        # BM25 score per live ordinal containing any of ``terms``.
+        live = len(self._ordinals)
+        norms = self._document_norms()
+        doc_ids = self._doc_ids
+        k1 = self.k1
+        scores: dict[int, float] = {}
+        scores_get = scores.get
+
+        for term in dict.fromkeys(terms):
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            ordinals, frequencies = postings
+            # Postings may still hold dead ordinals until the next compaction;
+            # they count towards df (at most doubling it) but never score.
+            df = len(ordinals)
+            factor = math.log(1 + max(live - df + 0.5, 0.5) / (df + 0.5)) * (k1 + 1)
+            for ordinal, frequency in zip(ordinals, frequencies):
+                scores[ordinal] = scores_get(ordinal, 0.0) + factor * frequency / (frequency + norms[ordinal])
+
+        if self._dead:
+            scores = {ordinal: score for ordinal, score in scores.items() if doc_ids[ordinal] is not None}
+        return scores
+
+    def _document_norms(self) -> array:
+        # The BM25 length normalisation per ordinal. It depends on the average
+        # document length, so it is rebuilt lazily after writes.
+        if self._norms is None:
+            average_length = self._total_length / len(self._ordinals) or 1.0
+            k1, b = self.k1, self.b
+            self._norms = array(
+                "d", (k1 * (1 - b + b * length / average_length) for length in self._lengths)
+            )
+        return self._norms
+
+    def _compact(self) -> None:
+        remap = array("i", [-1]) * len(self._doc_ids)
+        doc_ids: list[Optional[Hashable]] = []
+        lengths = array("I")
+        for ordinal, doc_id in enumerate(self._doc_ids):
+            if doc_id is not None:
+                remap[ordinal] = len(doc_ids)
+                doc_ids.append(doc_id)
+                lengths.append(self._lengths[ordinal])
+
+        postings = {}
+        for term, (ordinals, frequencies) in self._postings.items():
+            kept_ordinals, kept_frequencies = array("I"), array("I")
+            for ordinal, frequency in zip(ordinals, frequencies):
+                if remap[ordinal] >= 0:
+                    kept_ordinals.append(remap[ordinal])
+                    kept_frequencies.append(frequency)
+            if kept_ordinals:
+                postings[term] = (kept_ordinals, kept_frequencies)
+
+        self._doc_ids = doc_ids
+        self._ordinals = {doc_id: ordinal for ordinal, doc_id in enumerate(doc_ids)}
+        self._lengths = lengths
+        self._postings = postings
+        self._dead = 0
+        self._norms = None
@@ -0,0 +1,121 @@
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+from src.conf.config import settings
+
+
+class TTLCache:
+    """In-process LRU cache bounded by entry count and total size, with a TTL.
+
+    Everything runs on the event loop without awaiting, so no locking is
+    needed. ``token()``/``set(..., token=...)`` guard read-through fills: a
+    value read from the database before an invalidation is not stored after it.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        max_bytes: int,
+        ttl_seconds: float,
+        sizeof: Callable[[Any], int] = lambda value: 1,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._sizeof = sizeof
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, tuple[Any, float, int]] = OrderedDict()
+        self._bytes = 0
+        self._invalidations = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        value, expires_at, _ = entry
+        if expires_at <= self._clock():
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def token(self) -> int:
+        return self._invalidations
+
+    def set(self, key: Hashable, value: Any, token: Optional[int] = None) -> None:
+        if token is not None and token != self._invalidations:
+            return
+
+        size = self._sizeof(value)
+        if size > self.max_bytes:
+            return
+
+        if key in self._entries:
+            self._remove(key)
+
+        self._entries[key] = (value, self._clock() + self.ttl_seconds, size)
+        self._bytes += size
+
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        self._invalidations += 1
+        if key in self._entries:
+            self._remove(key)
+
+    def invalidate_where(self, predicate: Callable[[Any], bool]) -> None:
+        self._invalidations += 1
+        for key in [key for key, (value, _, _) in self._entries.items() if predicate(value)]:
+            self._remove(key)
+
+    def clear(self) -> None:
+        self._invalidations += 1
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+    def _remove(self, key: Hashable) -> None:
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
+
+
+post_cache = TTLCache(
+    max_entries=settings.POST_CACHE_MAX_ENTRIES,
+    max_bytes=settings.POST_CACHE_MAX_BYTES,
+    ttl_seconds=settings.POST_CACHE_TTL_SECONDS,
+    sizeof=lambda post: len(post.model_dump_json()),
+)
+
+# Search pages depend on many posts at once, so writes clear the whole cache
+# instead of invalidating single keys; clear() also bumps the fill token, so a
+# search that read the database before the write cannot store its result.
+search_cache = TTLCache(
+    max_entries=settings.SEARCH_CACHE_MAX_ENTRIES,
+    max_bytes=settings.SEARCH_CACHE_MAX_BYTES,
+    ttl_seconds=settings.SEARCH_CACHE_TTL_SECONDS,
+    sizeof=lambda page: len(page.model_dump_json()),
+)
@@ -3,17 +3,23 @@ from fastapi import HTTPException
 from src.repositories.comment_repository import CommentRepository
 from src.schemas.comment import CommentCreateDTO, CommentUpdateDTO
 from src.entity.models import User
+from src.services.cache import post_cache
 
 class CommentService:
     def __init__(self, comment_repo: CommentRepository):
         self.comment_repo = comment_repo
 
     async def add_comment(self, user_id: UUID, post_id: UUID, data: CommentCreateDTO):
-        return await self.comment_repo.create(user_id, post_id, data.message)
+        comment = await self.comment_repo.create(user_id, post_id, data.message)
+        post_cache.invalidate(post_id)
+        return comment
 
     async def get_comments_for_post(self, post_id: UUID):
         return await self.comment_repo.get_by_post_id(post_id)
 
+    async def get_comments_version(self, post_id: UUID):
+        return await self.comment_repo.get_post_comments_version(post_id)
+
     async def get_comment(self, comment_id: UUID):
         comment = await self.comment_repo.get_by_id(comment_id)
         if comment is None:
@@ -24,13 +30,17 @@ class CommentService:
         comment = await self.comment_repo.get_by_id(comment_id)
         if comment is None or comment.user_id != current_user.id:
             raise HTTPException(status_code=404, detail="Comment not found or not authorized")
-        return await self.comment_repo.update(comment_id, data.message)
+        updated = await self.comment_repo.update(comment_id, data.message)
+        post_cache.invalidate(comment.post_id)
+        return updated
 
     async def delete_comment(self, comment_id: UUID, current_user: User):
         comment = await self.comment_repo.get_by_id(comment_id)
         if comment is None or comment.user_id != current_user.id:
             raise HTTPException(status_code=404, detail="Comment not found or not authorized")
-        return await self.comment_repo.delete(comment_id)
+        deleted = await self.comment_repo.delete(comment_id)
+        post_cache.invalidate(comment.post_id)
+        return deleted
 
 
 
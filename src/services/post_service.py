@@ -1,7 +1,11 @@
 from uuid import UUID
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional
 from src.repositories.post_repository import PostRepository
-from src.schemas.post import PostResponse
+from src.core.pagination import DEFAULT_PAGE_SIZE
+from src.schemas.post import (
+    PostBatchResponse, PostCreateModel, PostCreateResponse, PostPage, PostResponse
+)
+from src.services.cache import post_cache, search_cache
 from src.entity.models import Post
 
 class PostService:
@@ -11,28 +15,101 @@ class PostService:
     
     async def create_post(
         self,
-        post_data: dict
-    ):
-        return await self.post_repo.create(post_data)
+        post_data: PostCreateModel
+    ) -> PostCreateResponse:
+        created = await self.post_repo.create(post_data)
+        search_cache.clear()
+        return created
 
-    async def get_post_by_id(self, post_id: UUID) -> PostResponse:
-        return await self.post_repo.get_post(post_id)
+    async def create_posts(
+        self,
+        posts_data: List[PostCreateModel]
+    ) -> List[PostCreateResponse]:
+        created = await self.post_repo.create_many(posts_data)
+        search_cache.clear()
+        return created
+
+    async def get_post_by_id(
+        self,
+        post_id: UUID,
+        fields: Optional[frozenset[str]] = None
+    ) -> PostResponse:
+        post = post_cache.get(post_id)
+        if post is None:
+            if fields:
+                # A partial post is not worth caching; fetch only what was asked.
+                return await self.post_repo.get_post_fields(post_id, fields)
+            token = post_cache.token()
+            post = await self.post_repo.get_post(post_id)
+            post_cache.set(post_id, post, token)
+        return post
+
+    async def get_posts_by_ids(self, post_ids: list[UUID]) -> PostBatchResponse:
+        ordered = list(dict.fromkeys(post_ids))
+        found = {}
+        misses = []
+        for post_id in ordered:
+            post = post_cache.get(post_id)
+            if post is None:
+                misses.append(post_id)
+            else:
+                found[post_id] = post
+
+        if misses:
+            token = post_cache.token()
+            for post in await self.post_repo.get_posts_by_ids(misses):
+                found[post.id] = post
+                post_cache.set(post.id, post, token)
 
-    async def get_all_posts(self) -> List[PostResponse]:
-        return await self.post_repo.get_posts()
+        return PostBatchResponse(
+            items=[found[post_id] for post_id in ordered if post_id in found],
+            missing=[post_id for post_id in ordered if post_id not in found],
+        )
+
+    async def get_post_version(self, post_id: UUID) -> tuple:
+        post = post_cache.get(post_id)
+        if post is not None and post.version is not None:
+            return post.version
+        return await self.post_repo.get_post_version(post_id)
+
+    async def get_all_posts(
+        self,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        fields: Optional[frozenset[str]] = None
+    ) -> PostPage:
+        return await self.post_repo.get_posts(limit, cursor, fields)
     
-    async def get_all_user_posts(self) -> List[PostResponse]:
-        return await self.post_repo.get_user_posts()
+    def stream_all_posts(
+        self,
+        cursor: Optional[str] = None,
+        fields: Optional[frozenset[str]] = None
+    ) -> AsyncIterator[PostResponse]:
+        return self.post_repo.stream_posts(cursor, fields)
+    
+    async def get_all_user_posts(
+        self,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+        fields: Optional[frozenset[str]] = None
+    ) -> PostPage:
+        return await self.post_repo.get_user_posts(limit, cursor, fields)
 
     async def update_post(
         self,
         post_id: UUID,
         description: Optional[str] = None
     ) -> PostResponse:
-        return await self.post_repo.update_post(post_id, description)
+        post = await self.post_repo.update_post(post_id, description)
+        post_cache.invalidate(post_id)
+        search_cache.clear()
+        return post
 
     async def delete_post(self, post_id: UUID) -> bool:
-        return await self.post_repo.delete_post(post_id)
+        deleted = await self.post_repo.delete_post(post_id)
+        post_cache.invalidate(post_id)
+        search_cache.clear()
+        return deleted
     
     async def is_author_or_admin(self, post: Post):
         return await self.post_repo.is_author_or_admin(post)
@@ -0,0 +1,119 @@
+import asyncio
+import logging
+from typing import AsyncContextManager, Awaitable, Callable, Optional
+from uuid import UUID
+
+from src.conf.config import settings
+
+logger = logging.getLogger("uvicorn.error")
+
+# post_id -> number of new 1..5 star ratings still to be added to post_rating_stats.
+RatingDeltas = dict[UUID, tuple[int, ...]]
+NO_RATINGS = (0,) * 5
+
+
+class RatingAggregator:
+    """Coalesces post_rating_stats updates from individual ratings.
+
+    ``add`` only records the delta in memory; a background task writes all
+    pending deltas in one statement every ``flush_interval`` seconds, or as
+    soon as ``max_events`` ratings are waiting. ``stop`` writes whatever is
+    left. Like the tag index it is per process: each worker buffers its own
+    ratings, and because the deltas are additive the workers never conflict.
+    """
+
+    def __init__(self, flush_interval: float, max_events: int):
+        self.flush_interval = flush_interval
+        self.max_events = max_events
+        self._pending: RatingDeltas = {}
+        self._events = 0
+        self._wakeup = asyncio.Event()
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self._session_factory: Optional[Callable[[], AsyncContextManager]] = None
+        self._write: Optional[Callable[..., Awaitable[None]]] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    def __len__(self) -> int:
+        return self._events
+
+    def start(
+        self,
+        session_factory: Callable[[], AsyncContextManager],
+        write: Callable[..., Awaitable[None]],
+    ) -> None:
+        """Begin flushing with ``write(db, deltas)`` in sessions from ``session_factory``."""
+        if self.running or self.flush_interval <= 0:
+            return
+        self._session_factory = session_factory
+        self._write = write
+        self._stopping = False
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        # The loop is asked to finish rather than cancelled, so a flush in
+        # flight completes (or fails and keeps its deltas) before the last one.
+        if self._task is None:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        task, self._task = self._task, None
+        await task
+        await self.flush()
+
+    def add(self, post_id: UUID, rating: int) -> bool:
+        """Buffer one rating; False once ``stop`` has begun, when the caller writes it itself."""
+        if not self.running:
+            return False
+        counts = list(self._pending.get(post_id, NO_RATINGS))
+        counts[rating - 1] += 1
+        self._pending[post_id] = tuple(counts)
+        self._events += 1
+        if self._events >= self.max_events:
+            self._wakeup.set()
+        return True
+
+    async def flush(self) -> RatingDeltas:
+        """Write the pending deltas; on failure they are kept for the next flush."""
+        async with self._lock:
+            deltas, self._pending = self._pending, {}
+            events, self._events = self._events, 0
+            if not deltas:
+                return deltas
+            try:
+                async with self._session_factory() as db:
+                    await self._write(db, deltas)
+            except BaseException:
+                # Including cancellation: the deltas were taken out of
+                # _pending and their transaction did not commit.
+                self._merge(deltas, events)
+                raise
+            return deltas
+
+    def _merge(self, deltas: RatingDeltas, events: int) -> None:
+        for post_id, counts in deltas.items():
+            pending = self._pending.get(post_id, NO_RATINGS)
+            self._pending[post_id] = tuple(a + b for a, b in zip(pending, counts))
+        self._events += events
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Rating stats flush failed, retrying: {e}")
+
+
+rating_aggregator = RatingAggregator(
+    flush_interval=settings.RATING_FLUSH_INTERVAL_MS / 1000,
+    max_events=settings.RATING_FLUSH_MAX_EVENTS,
+)
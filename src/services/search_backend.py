@@ -0,0 +1,141 @@
+import logging
+from abc import ABC, abstractmethod
+from typing import Iterable, NamedTuple, Optional
+
+from sqlalchemy import bindparam, case, false, func, literal
+from sqlalchemy.sql.elements import ColumnElement
+
+from src.conf.config import settings
+from src.entity.models import Post
+from src.services.bm25_index import BM25Index, tokenize
+
+logger = logging.getLogger("uvicorn.error")
+
+
+class KeywordMatch(NamedTuple):
+    condition: ColumnElement
+    rank: ColumnElement
+
+
+def keyword_words(keyword: Optional[str]) -> list[str]:
+    """Comma-separated search keywords, any of which may match.
+
+    Every backend reads a keyword with several words ("sea city") as all of
+    them together, and the comma-separated keywords as alternatives.
+    """
+    return [word.strip() for word in (keyword or "").split(",") if word.strip()]
+
+
+def document_text(title: str, description: str, tag_names: str) -> str:
+    return " ".join(part for part in (title, tag_names, description) if part)
+
+
+class SearchBackend(ABC):
+    """Where the keyword part of a post search is answered.
+
+    ``match`` turns the keyword into a WHERE condition and a relevance
+    expression for ``build_search_stmt``; everything else (filters, paging,
+    facets) stays in SQL. Backends that keep their own index are told about
+    post writes through ``index_post``/``remove_post``.
+    """
+
+    name: str
+
+    @abstractmethod
+    def match(self, keyword: Optional[str]) -> Optional[KeywordMatch]:
+        ...
+
+    def load(self, documents: Iterable[tuple]) -> None:
+        pass
+
+    def index_post(self, post_id, title: str, description: str, tag_names: str) -> None:
+        pass
+
+    def remove_post(self, post_id) -> None:
+        pass
+
+
+class PostgresSearchBackend(SearchBackend):
+    """Full-text search on the generated ``posts.search_vector`` column."""
+
+    name = "postgres"
+
+    def match(self, keyword: Optional[str]) -> Optional[KeywordMatch]:
+        words = keyword_words(keyword)
+        if not words:
+            return None
+        query = func.websearch_to_tsquery("simple", " or ".join(words))
+        return KeywordMatch(
+            condition=Post.search_vector.bool_op("@@")(query),
+            rank=func.ts_rank(Post.search_vector, query),
+        )
+
+
+class MemorySearchBackend(SearchBackend):
+    """BM25 over an in-process inverted index, for databases without Postgres FTS.
+
+    Every matching post is part of the condition, as ``id IN (:ids)`` with
+    an expanding parameter that any dialect can render, so date and rating
+    sorts, paging and totals see the whole match set. Only the ``max_hits`` best are scored in the CASE
+    expression relevance sorts by; the rest rank 0 and follow in id order.
+    Like the tag index it is per process and sees the writes of its own
+    worker only.
+    """
+
+    name = "memory"
+
+    def __init__(self, max_hits: int, memo_size: int = 256):
+        self.index = BM25Index()
+        self.max_hits = max_hits
+        # One search builds the statement for its page, count and facets;
+        # the ranking is computed once and reused until the next write.
+        self._memo: dict[tuple[tuple[str, ...], ...], KeywordMatch] = {}
+        self._memo_size = memo_size
+
+    def match(self, keyword: Optional[str]) -> Optional[KeywordMatch]:
+        words = keyword_words(keyword)
+        if not words:
+            return None
+
+        groups = tuple(tuple(tokenize(word)) for word in words)
+        cached = self._memo.get(groups)
+        if cached is not None:
+            return cached
+
+        best, matched = self.index.match(groups, self.max_hits)
+        if matched:
+            match = KeywordMatch(
+                condition=Post.id.in_(bindparam("search_ids", matched, expanding=True)),
+                rank=case(dict(best), value=Post.id, else_=0.0),
+            )
+        else:
+            match = KeywordMatch(condition=false(), rank=literal(0.0))
+
+        if len(self._memo) >= self._memo_size:
+            self._memo.clear()
+        self._memo[groups] = match
+        return match
+
+    def load(self, documents: Iterable[tuple]) -> None:
+        self.index = BM25Index()
+        for post_id, title, description, tag_names in documents:
+            self.index.add(post_id, document_text(title, description, tag_names))
+        self._memo.clear()
+        logger.info(f"Search index loaded with {len(self.index)} posts")
+
+    def index_post(self, post_id, title: str, description: str, tag_names: str) -> None:
+        self.index.add(post_id, document_text(title, description, tag_names))
+        self._memo.clear()
+
+    def remove_post(self, post_id) -> None:
+        self.index.remove(post_id)
+        self._memo.clear()
+
+
+def make_search_backend(name: str) -> SearchBackend:
+    if name == "memory":
+        return MemorySearchBackend(max_hits=settings.SEARCH_MEMORY_MAX_HITS)
+    return PostgresSearchBackend()
+
+
+search_backend = make_search_backend(settings.SEARCH_BACKEND)
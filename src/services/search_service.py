@@ -0,0 +1,78 @@
+from datetime import datetime, timezone
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.repositories.post_repository import PostRepository
+from src.repositories.search_filter import search_posts
+from src.schemas.search_filter import PostSearchPage, PostSearchRequest
+from src.services.cache import search_cache
+from src.services.search_backend import search_backend
+
+
+def _utc(value: datetime) -> str:
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value.isoformat()
+
+
+def search_cache_key(
+    filters: PostSearchRequest,
+    fields: Optional[frozenset[str]] = None,
+    facets: Optional[frozenset[str]] = None,
+) -> tuple:
+    """Canonical form of a search: requests that select the same page share a key."""
+    words = sorted({
+        word.strip().lower() for word in (filters.keyword or "").split(",") if word.strip()
+    })
+    # The schema already strips the fragment; ILIKE ignores its case.
+    tags = filters.tags.lower() if filters.tags else None
+
+    # Mirrors build_search_stmt: a single bound only matters by its day.
+    if filters.from_date and filters.to_date:
+        dates = (_utc(filters.from_date), _utc(filters.to_date))
+    elif filters.from_date or filters.to_date:
+        dates = ((filters.from_date or filters.to_date).date().isoformat(),)
+    else:
+        dates = ()
+
+    sort_by = filters.sort_by
+    if sort_by == "relevance" and not words:
+        sort_by = "date"
+
+    return (
+        tuple(words),
+        tags,
+        dates,
+        None if filters.exact_star is None else int(filters.exact_star),
+        sort_by,
+        filters.order,
+        filters.limit,
+        filters.cursor,
+        tuple(sorted(fields)) if fields else None,
+        tuple(sorted(facets)) if facets else None,
+    )
+
+
+class SearchService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def search_posts(
+        self,
+        filters: PostSearchRequest,
+        fields: Optional[frozenset[str]] = None,
+        facets: Optional[frozenset[str]] = None,
+    ) -> PostSearchPage:
+        key = search_cache_key(filters, fields, facets)
+        page = search_cache.get(key)
+        if page is None:
+            token = search_cache.token()
+            page = await search_posts(filters, self.db, fields, facets)
+            search_cache.set(key, page, token)
+        return page
+
+
+async def load_search_backend(db: AsyncSession) -> None:
+    """Fill an in-process search backend from the posts table; Postgres needs nothing."""
+    if search_backend.name == "postgres":
+        return
+    search_backend.load(await PostRepository(db).get_search_documents())
@@ -0,0 +1,80 @@
+import heapq
+import logging
+from bisect import bisect_left, insort
+from typing import Iterable
+
+from src.repositories.tag_repository import TagRepository
+
+logger = logging.getLogger("uvicorn.error")
+
+
+class TagPrefixIndex:
+    """Case-insensitive prefix lookup over tag names, ranked by post count.
+
+    Keys are kept in a sorted list, so the tags sharing a prefix are one
+    contiguous slice found with two bisections. Answers for a prefix are
+    memoised until the next write. The index lives in the process: each
+    worker loads its own copy at startup and only sees the tags its own
+    requests create afterwards.
+    """
+
+    def __init__(self, memo_size: int = 1024):
+        self._keys: list[str] = []
+        self._names: dict[str, str] = {}
+        self._counts: dict[str, int] = {}
+        self._memo: dict[tuple[str, int], list[tuple[str, int]]] = {}
+        self._memo_size = memo_size
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def load(self, counts: Iterable[tuple[str, int]]) -> None:
+        self._names = {}
+        self._counts = {}
+        for name, count in counts:
+            key = name.casefold()
+            self._names[key] = name
+            self._counts[key] = self._counts.get(key, 0) + count
+        self._keys = sorted(self._names)
+        self._memo.clear()
+
+    def add(self, names: Iterable[str]) -> None:
+        """Count one more post for each name, inserting names not seen yet."""
+        for name in names:
+            key = name.casefold()
+            if key not in self._counts:
+                insort(self._keys, key)
+                self._names[key] = name
+                self._counts[key] = 0
+            self._counts[key] += 1
+        self._memo.clear()
+
+    def suggest(self, prefix: str, limit: int = 10) -> list[tuple[str, int]]:
+        prefix = prefix.casefold()
+        memo_key = (prefix, limit)
+        cached = self._memo.get(memo_key)
+        if cached is not None:
+            return cached
+
+        start = bisect_left(self._keys, prefix)
+        end = bisect_left(self._keys, prefix + "\U0010ffff", lo=start)
+        best = heapq.nsmallest(
+            limit,
+            self._keys[start:end],
+            key=lambda key: (-self._counts[key], key),
+        )
+        result = [(self._names[key], self._counts[key]) for key in best]
+
+        if len(self._memo) >= self._memo_size:
+            self._memo.clear()
+        self._memo[memo_key] = result
+        return result
+
+
+tag_index = TagPrefixIndex()
+
+
+async def load_tag_index(db) -> None:
+    counts = await TagRepository(db).get_post_counts()
+    tag_index.load(counts)
+    logger.info(f"Tag index loaded with {len(tag_index)} tags")
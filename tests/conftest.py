@@ -7,8 +7,45 @@ from unittest.mock import AsyncMock, MagicMock
 from src.entity.models import User, Comment, UserTypeEnum
 from src.schemas.user_schema import UserLogin, UserCreate
 from src.entity.models import Post, PostRating, User
+from src.services.cache import post_cache, search_cache
+from src.services.tag_index import tag_index
 
 
+def pytest_addoption(parser):
+    parser.addoption(
+        "--run-postgres", action="store_true",
+        help="run the tests marked postgres against the server at DB_URL",
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--run-postgres"):
+        return
+    skip = pytest.mark.skip(reason="needs PostgreSQL; run with --run-postgres")
+    for item in items:
+        if "postgres" in item.keywords:
+            item.add_marker(skip)
+
+
+@pytest.fixture(autouse=True)
+def clear_post_cache():
+    post_cache.clear()
+    yield
+    post_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_search_cache():
+    search_cache.clear()
+    yield
+    search_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_tag_index():
+    tag_index.load([])
+    yield
+    tag_index.load([])
 
 
 @pytest.fixture
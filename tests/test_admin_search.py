@@ -5,7 +5,7 @@ from datetime import datetime, timezone
 from unittest.mock import AsyncMock, MagicMock
 
 from src.entity.models import User
-from src.schemas.admin_search import UserSearchRequest
+from src.schemas.admin_search import UserOut, UserSearchRequest
 from src.repositories.admin_search_repository import get_user_by_id, search_users
 
 
@@ -65,11 +65,13 @@ async def test_search_users_basic():
         updated_at=datetime.now(timezone.utc)
     )
 
-    mock_all = MagicMock()
-    mock_all.all = AsyncMock(return_value=[mock_user])
+    row = {name: getattr(mock_user, name) for name in UserOut.model_fields}
+    row["sort_key"] = mock_user.name
 
     mock_session = AsyncMock()
-    mock_session.execute.return_value = MagicMock(scalars=MagicMock(return_value=mock_all))
+    mock_session.execute.return_value = MagicMock(
+        mappings=MagicMock(return_value=MagicMock(all=MagicMock(return_value=[row])))
+    )
 
     filters = UserSearchRequest(search="test")
 
@@ -78,4 +80,4 @@ async def test_search_users_basic():
         filters=filters,
         current_user_is_admin=True
     )
-    assert result == [mock_user]
+    assert [user.id for user in result.items] == [mock_user.id]
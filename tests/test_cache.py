@@ -0,0 +1,87 @@
+import pytest
+from src.services.cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def test_get_counts_hits_and_misses(clock):
+    cache = TTLCache(max_entries=10, max_bytes=100, ttl_seconds=30, clock=clock)
+    cache.set("a", 1)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = TTLCache(max_entries=10, max_bytes=100, ttl_seconds=30, clock=clock)
+    cache.set("a", 1)
+
+    clock.now = 30
+    assert cache.get("a") is None
+    assert cache.stats()["expirations"] == 1
+    assert cache.stats()["entries"] == 0
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = TTLCache(max_entries=2, max_bytes=100, ttl_seconds=30, clock=clock)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_size_bound_evicts_until_it_fits(clock):
+    cache = TTLCache(max_entries=10, max_bytes=10, ttl_seconds=30, sizeof=len, clock=clock)
+    cache.set("a", "xxxx")
+    cache.set("b", "xxxx")
+    cache.set("c", "xxxx")
+
+    assert cache.get("a") is None
+    assert cache.stats()["bytes"] == 8
+
+    cache.set("huge", "x" * 11)
+    assert cache.get("huge") is None
+
+
+def test_invalidate_drops_entry_and_stale_fills(clock):
+    cache = TTLCache(max_entries=10, max_bytes=100, ttl_seconds=30, clock=clock)
+    cache.set("a", 1)
+
+    token = cache.token()
+    cache.invalidate("a")
+    cache.set("a", "stale", token)
+
+    assert cache.get("a") is None
+
+
+def test_invalidate_where_drops_matching_entries_and_stale_fills(clock):
+    cache = TTLCache(max_entries=10, max_bytes=100, ttl_seconds=30, clock=clock)
+    cache.set("a", 1)
+    cache.set("b", 2)
+
+    token = cache.token()
+    cache.invalidate_where(lambda value: value == 1)
+    cache.set("c", 1, token)
+
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+    assert cache.get("c") is None
+    assert cache.stats()["entries"] == 1
@@ -0,0 +1,139 @@
+import pytest
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+from starlette.requests import Request
+
+from main import app
+from src.core.conditional import is_not_modified, make_etag, not_modified
+from src.database.db import get_db
+from src.repositories.edit_profile import update_user_profile
+from src.schemas.post import PostResponse
+from src.services.cache import post_cache
+
+
+def make_request(**headers):
+    raw = [(k.replace("_", "-").encode(), v.encode()) for k, v in headers.items()]
+    return Request({"type": "http", "headers": raw})
+
+
+def test_make_etag_is_stable_and_weak():
+    stamp = datetime(2025, 4, 1, 12, 0)
+
+    assert make_etag(stamp, 3) == make_etag(stamp, 3)
+    assert make_etag(stamp, 3) != make_etag(stamp, 4)
+    assert make_etag(stamp, 3).startswith('W/"')
+
+
+def test_if_none_match_uses_weak_comparison():
+    etag = make_etag("a", 1)
+    strong = etag.removeprefix("W/")
+
+    assert is_not_modified(make_request(if_none_match=f'"other", {strong}'), etag)
+    assert is_not_modified(make_request(if_none_match="*"), etag)
+    assert not is_not_modified(make_request(if_none_match='"other"'), etag)
+
+
+def test_if_none_match_takes_precedence_over_if_modified_since():
+    request = make_request(
+        if_none_match='"other"',
+        if_modified_since="Tue, 01 Apr 2025 12:00:00 GMT",
+    )
+
+    assert not is_not_modified(request, make_etag("a"), datetime(2025, 4, 1, 11, 0))
+
+
+def test_if_modified_since():
+    request = make_request(if_modified_since="Tue, 01 Apr 2025 12:00:00 GMT")
+    etag = make_etag("a")
+
+    assert is_not_modified(request, etag, datetime(2025, 4, 1, 12, 0, 0, 500))
+    assert not is_not_modified(request, etag, datetime(2025, 4, 1, 12, 0, 1))
+    assert not is_not_modified(make_request(if_modified_since="garbage"), etag, datetime(2025, 4, 1))
+
+
+def test_not_modified_response_has_no_body():
+    response = not_modified(make_etag("a"), datetime(2025, 4, 1, 12, 0))
+
+    assert response.status_code == 304
+    assert response.body == b""
+    assert response.headers["Last-Modified"] == "Tue, 01 Apr 2025 12:00:00 GMT"
+
+
+@pytest.fixture
+def version_db():
+    updated_at = datetime(2025, 4, 1, 12, 0)
+    author_updated_at = datetime(2025, 3, 1, 9, 0)
+    result = MagicMock()
+    result.first.return_value = SimpleNamespace(
+        updated_at=updated_at, rating_count=2, user_updated_at=author_updated_at
+    )
+    db = MagicMock()
+    db.execute = AsyncMock(return_value=result)
+
+    async def override():
+        yield db
+
+    app.dependency_overrides[get_db] = override
+    yield db, make_etag(updated_at, 2, author_updated_at)
+    app.dependency_overrides.pop(get_db, None)
+
+
+def test_get_post_returns_304_from_version_probe(client, version_db):
+    db, etag = version_db
+
+    response = client.get(f"/posts/{uuid4()}", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    db.execute.assert_awaited_once()
+    assert "JOIN users ON users.id = posts.user_id" in str(db.execute.await_args.args[0])
+
+
+def test_author_profile_change_changes_the_post_etag(client, version_db):
+    db, etag = version_db
+    db.execute.return_value.first.return_value.user_updated_at = datetime(2025, 4, 2, 8, 0)
+    # The probe no longer matches, so the post itself is read (here: gone).
+    missing = MagicMock()
+    missing.scalar_one_or_none.return_value = None
+    db.execute.side_effect = [db.execute.return_value, missing]
+
+    response = client.get(f"/posts/{uuid4()}", headers={"If-None-Match": etag})
+
+    assert response.status_code == 404
+    assert db.execute.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_profile_edit_evicts_cached_posts_and_changes_their_etag(client, version_db):
+    db, _ = version_db
+    author_id = uuid4()
+    post_id = uuid4()
+    row = db.execute.return_value.first.return_value
+    author_updated_at = row.user_updated_at
+    cached = PostResponse(id=post_id, title="t", user_id=author_id, image_url="https://img")
+    cached._version = (row.updated_at, row.rating_count, author_updated_at)
+    post_cache.set(post_id, cached)
+    etag = make_etag(*cached.version)
+
+    author = SimpleNamespace(id=author_id, img_link=None, updated_at=author_updated_at)
+    profile_db = MagicMock()
+    profile_db.execute = AsyncMock(return_value=MagicMock(**{"scalars.return_value.first.return_value": author}))
+    profile_db.commit = AsyncMock()
+    profile_db.refresh = AsyncMock()
+    await update_user_profile(author_id, SimpleNamespace(dict=lambda **kw: {}), profile_db, avatar_url="https://new")
+
+    assert author.updated_at > author_updated_at
+    assert post_cache.get(post_id) is None
+
+    # Uncached now, so the version is probed and carries the new author version.
+    row.user_updated_at = author.updated_at
+    missing = MagicMock()
+    missing.scalar_one_or_none.return_value = None
+    db.execute.side_effect = [db.execute.return_value, missing]
+
+    response = client.get(f"/posts/{post_id}", headers={"If-None-Match": etag})
+
+    assert response.status_code == 404
+    assert db.execute.await_count == 2
@@ -1,13 +1,25 @@
 import pytest
 from unittest.mock import AsyncMock, MagicMock
-from uuid import uuid4
+from uuid import UUID, uuid4
 from fastapi import HTTPException
+from sqlalchemy.dialects import postgresql
+from main import app
+from src.core.conditional import make_etag
+from src.core.fieldsets import parse_fields
+from src.database.db import get_db
+from src.core.pagination import decode_cursor
 from src.repositories.post_repository import PostRepository
+from src.services.cache import post_cache
 from src.services.post_service import PostService
-from src.schemas.post import PostCreateModel, PostCreateResponse
+from src.services.tag_index import tag_index
+from pydantic import ValidationError
+from src.schemas.post import (
+    MAX_BATCH_SIZE, PostBatchRequest, PostCreateModel, PostCreateResponse, PostResponse
+)
 from src.entity.models import Post, PostRating, User
 from datetime import datetime
 from io import BytesIO
+from types import SimpleNamespace
 from src.entity.models import User, UserTypeEnum
 from unittest.mock import AsyncMock, patch
 
@@ -48,54 +60,130 @@ def test_user():
         type=UserTypeEnum.user,
     )
 
-@patch("src.repositories.post_repository.Post", autospec=True)
 @pytest.mark.asyncio
-async def test_create_post_success(mock_post_class, fake_db, current_user):
-    fake_post_id = uuid4()
-    mock_post_instance = MagicMock()
-    mock_post_instance.id = fake_post_id
-    mock_post_instance.title = "Test Post"
-    mock_post_instance.image_url = "img_url"
-    mock_post_instance.user_id = current_user.id
-
-    mock_post_class.return_value = mock_post_instance
-
+async def test_create_post_success(fake_db, current_user):
     post_data = PostCreateModel(
         title="Test Post",
         description="A test post",
         image_url="img_url",
         location="Test City",
-        tags=[{"name": "tag1"}]
+        tags=[{"name": "tag1"}, {"name": "tag2"}, {"name": "tag1"}]
     )
 
     fake_db.execute = AsyncMock()
     fake_db.commit = AsyncMock()
-    fake_db.flush = AsyncMock()
-    fake_db.refresh = AsyncMock()
 
     repo = PostRepository(fake_db, current_user)
     service = PostService(repo)
-    service.post_repo.get_post = AsyncMock(return_value=mock_post_instance)
 
     result = await service.create_post(post_data)
 
     assert isinstance(result, PostCreateResponse)
-    assert result.id == fake_post_id
     assert result.image_url == "img_url"
 
+    post_insert, tag_upsert, link_insert = [call.args[0] for call in fake_db.execute.await_args_list]
+    assert post_insert.table.name == "posts"
+    tag_sql = str(tag_upsert.compile(dialect=postgresql.dialect()))
+    assert "ON CONFLICT (name) DO NOTHING" in tag_sql
+    links = link_insert.compile().params
+    assert sorted(v for k, v in links.items() if k.startswith("tag_name")) == ["tag1", "tag2"]
+    fake_db.commit.assert_awaited_once()
+    assert tag_index.suggest("tag") == [("tag1", 1), ("tag2", 1)]
+
+@pytest.mark.asyncio
+async def test_create_posts_bulk_uses_one_transaction(fake_db, current_user):
+    posts = [
+        PostCreateModel(title=f"Post {i}", description=None, image_url=f"img_{i}", location=None, tags=[])
+        for i in range(3)
+    ]
+    fake_db.execute = AsyncMock()
+    fake_db.commit = AsyncMock()
+
+    result = await PostService(PostRepository(fake_db, current_user)).create_posts(posts)
+
+    assert [r.image_url for r in result] == ["img_0", "img_1", "img_2"]
+    assert len({r.id for r in result}) == 3
+    fake_db.execute.assert_awaited_once()
+    fake_db.commit.assert_awaited_once()
+
+def post_row(**overrides):
+    row = dict(
+        id=uuid4(),
+        title="Sample Title",
+        user_id=uuid4(),
+        description="Sample Description",
+        image_url="http://test.com/image.jpg",
+        location="Moon",
+        created_at=datetime.now(),
+        updated_at=datetime.now(),
+        avg_rating=4.5,
+        rating_count=2,
+        user_name="Author",
+        user_img_link=None,
+        user_updated_at=datetime(2025, 3, 1),
+        tag_names=["sea", "sun"],
+    )
+    row.update(overrides)
+    return SimpleNamespace(**row)
+
 @pytest.mark.asyncio
-async def test_get_all_posts(fake_db, sample_post):
+async def test_get_all_posts(fake_db):
+    row = post_row()
     result_mock = MagicMock()
-    scalars_mock = MagicMock()
-    scalars_mock.all.return_value = [sample_post]
-    result_mock.scalars.return_value = scalars_mock
+    result_mock.all.return_value = [row]
     fake_db.execute = AsyncMock(return_value=result_mock)
 
     service = PostService(PostRepository(fake_db))
-    posts = await service.get_all_posts()
+    page = await service.get_all_posts()
     
-    assert len(posts) == 1
-    assert posts[0].title == "Sample Title"
+    assert len(page.items) == 1
+    post = page.items[0]
+    assert post.title == "Sample Title"
+    assert post.avg_rating == 4.5
+    assert post.rating_count == 2
+    assert post.user.id == row.user_id
+    assert [t.name for t in post.tags] == ["sea", "sun"]
+    assert page.next_cursor is None
+    fake_db.execute.assert_awaited_once()
+
+@pytest.mark.asyncio
+async def test_get_all_posts_without_ratings_or_tags(fake_db):
+    result_mock = MagicMock()
+    result_mock.all.return_value = [post_row(avg_rating=None, rating_count=None, tag_names=None)]
+    fake_db.execute = AsyncMock(return_value=result_mock)
+
+    service = PostService(PostRepository(fake_db))
+    post = (await service.get_all_posts()).items[0]
+
+    assert post.avg_rating is None
+    assert post.rating_count == 0
+    assert post.tags == []
+
+@pytest.mark.asyncio
+async def test_get_all_posts_returns_next_cursor(fake_db):
+    rows = [
+        post_row(title=f"Post {i}", created_at=datetime(2025, 4, 10 - i))
+        for i in range(3)
+    ]
+    result_mock = MagicMock()
+    result_mock.all.return_value = rows
+    fake_db.execute = AsyncMock(return_value=result_mock)
+
+    service = PostService(PostRepository(fake_db))
+    page = await service.get_all_posts(limit=2)
+
+    assert [p.title for p in page.items] == ["Post 0", "Post 1"]
+    assert decode_cursor(page.next_cursor, datetime, UUID) == (rows[1].created_at, rows[1].id)
+
+@pytest.mark.asyncio
+async def test_get_all_posts_invalid_cursor(fake_db):
+    fake_db.execute = AsyncMock()
+
+    service = PostService(PostRepository(fake_db))
+    with pytest.raises(HTTPException) as e:
+        await service.get_all_posts(cursor="not-a-cursor")
+    assert e.value.status_code == 400
+    fake_db.execute.assert_not_awaited()
 
 @pytest.mark.asyncio
 async def test_get_post_by_id_found(fake_db, sample_post):
@@ -109,6 +197,33 @@ async def test_get_post_by_id_found(fake_db, sample_post):
     assert post.id == sample_post.id
     assert post.title == "Sample Title"
 
+@pytest.mark.asyncio
+async def test_get_post_by_id_is_served_from_cache(fake_db, sample_post):
+    result_mock = MagicMock()
+    result_mock.scalar_one_or_none.return_value = sample_post
+    fake_db.execute = AsyncMock(return_value=result_mock)
+
+    service = PostService(PostRepository(fake_db))
+    first = await service.get_post_by_id(sample_post.id)
+    second = await service.get_post_by_id(sample_post.id)
+
+    assert first is second
+    fake_db.execute.assert_awaited_once()
+    assert post_cache.stats()["hits"] == 1
+
+@pytest.mark.asyncio
+async def test_delete_post_invalidates_cache(fake_db, sample_post, current_user):
+    result_mock = MagicMock(rowcount=1)
+    result_mock.scalar_one_or_none.return_value = sample_post
+    fake_db.execute = AsyncMock(return_value=result_mock)
+    fake_db.commit = AsyncMock()
+
+    service = PostService(PostRepository(fake_db, current_user))
+    await service.get_post_by_id(sample_post.id)
+    assert await service.delete_post(sample_post.id) is True
+
+    assert post_cache.get(sample_post.id) is None
+
 @pytest.mark.asyncio
 async def test_get_post_by_id_not_found(fake_db):
     result_mock = MagicMock()
@@ -121,30 +236,30 @@ async def test_get_post_by_id_not_found(fake_db):
     assert e.value.status_code == 404
 
 @pytest.mark.asyncio
-async def test_update_post_success(fake_db, sample_post, current_user):
-    fake_db.execute = AsyncMock()
-
-    updated_post = sample_post
-    updated_post.description = "Updated description"
-
-    fake_db.execute.side_effect = [
-        MagicMock(),
-        MagicMock(scalar_one_or_none=MagicMock(return_value=updated_post))  # for SELECT
-    ]
-
+async def test_update_post_success(fake_db, current_user):
+    row = post_row(user_id=current_user.id, description="Updated description")
+    result_mock = MagicMock()
+    result_mock.first.return_value = row
+    fake_db.execute = AsyncMock(return_value=result_mock)
     fake_db.commit = AsyncMock()
-    fake_db.refresh = AsyncMock()
 
     service = PostService(PostRepository(fake_db, current_user))
-    result = await service.update_post(sample_post.id, "Updated description")
+    result = await service.update_post(row.id, "Updated description")
 
     assert result.description == "Updated description"
+    assert result.rating_count == 2
+    fake_db.execute.assert_awaited_once()
     fake_db.commit.assert_awaited_once()
 
+    sql = str(fake_db.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+    assert sql.startswith("WITH updated_post AS \n(UPDATE posts")
+    assert "posts.user_id = " in sql
+    assert "RETURNING" in sql
+
 @pytest.mark.asyncio
 async def test_update_post_not_found(fake_db, current_user):
     result_mock = MagicMock()
-    result_mock.scalar_one_or_none = MagicMock(return_value=None)
+    result_mock.first = MagicMock(return_value=None)
     fake_db.execute = AsyncMock(return_value=result_mock)
     fake_db.commit = AsyncMock()
 
@@ -156,6 +271,21 @@ async def test_update_post_not_found(fake_db, current_user):
     assert exc_info.value.status_code == 404
     assert exc_info.value.detail == "Post not found"
 
+@pytest.mark.asyncio
+async def test_update_post_of_another_user_is_forbidden(fake_db, current_user):
+    fake_db.execute = AsyncMock(side_effect=[
+        MagicMock(first=MagicMock(return_value=None)),
+        MagicMock(first=MagicMock(return_value=(uuid4(),))),
+    ])
+    fake_db.commit = AsyncMock()
+
+    service = PostService(PostRepository(fake_db, current_user))
+
+    with pytest.raises(HTTPException) as exc_info:
+        await service.update_post(uuid4(), "New text")
+
+    assert exc_info.value.status_code == 403
+
 @pytest.mark.asyncio
 async def test_delete_post_success(fake_db, sample_post, current_user):
     fake_db.execute = AsyncMock(return_value=MagicMock(rowcount=1))
@@ -166,12 +296,138 @@ async def test_delete_post_success(fake_db, sample_post, current_user):
     result = await service.delete_post(sample_post.id)
 
     assert result is True
+    fake_db.execute.assert_awaited_once()
+    sql = str(fake_db.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+    assert sql.startswith("DELETE FROM posts")
+    assert "posts.user_id = " in sql
 
 @pytest.mark.asyncio
 async def test_delete_post_not_found(fake_db, current_user):
-    fake_db.execute = AsyncMock(return_value=MagicMock(rowcount=0))
+    fake_db.execute = AsyncMock(side_effect=[
+        MagicMock(rowcount=0),
+        MagicMock(first=MagicMock(return_value=None)),
+    ])
+    fake_db.commit = AsyncMock()
+
+    service = PostService(PostRepository(fake_db, current_user))
+
+    with pytest.raises(HTTPException) as exc_info:
+        await service.delete_post(uuid4())
+
+    assert exc_info.value.status_code == 404
+    assert exc_info.value.detail == "Post not found"
+
+@pytest.mark.asyncio
+async def test_delete_post_of_another_user_is_forbidden(fake_db, current_user):
+    post_id = uuid4()
+    fake_db.execute = AsyncMock(side_effect=[
+        MagicMock(rowcount=0),
+        MagicMock(first=MagicMock(return_value=(post_id, uuid4()))),
+    ])
     fake_db.commit = AsyncMock()
 
     service = PostService(PostRepository(fake_db, current_user))
-    result = await service.delete_post(uuid4())
-    assert result is False
+
+    with pytest.raises(HTTPException) as exc_info:
+        await service.delete_post(post_id)
+
+    assert exc_info.value.status_code == 403
+    assert exc_info.value.detail == "You are not allowed to delete this post."
+
+def test_parse_fields_rejects_unknown_fields():
+    assert parse_fields(None, PostResponse) is None
+    assert parse_fields("id, image_url", PostResponse) == {"id", "image_url"}
+
+    with pytest.raises(HTTPException) as e:
+        parse_fields("id,password", PostResponse)
+    assert e.value.status_code == 400
+
+@pytest.mark.asyncio
+async def test_sparse_fields_skip_unneeded_joins(fake_db):
+    result_mock = MagicMock()
+    result_mock.all.return_value = [post_row()]
+    fake_db.execute = AsyncMock(return_value=result_mock)
+    fields = frozenset({"id", "image_url", "avg_rating"})
+
+    repo = PostRepository(fake_db, user_id=uuid4())
+    page = await PostService(repo).get_all_user_posts(fields=fields)
+
+    sql = str(fake_db.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+    assert "post_rating_stats" in sql
+    assert "users" not in sql
+    assert "array_agg" not in sql
+    assert page.items[0].model_dump(include=fields) == {
+        "id": page.items[0].id, "image_url": "http://test.com/image.jpg", "avg_rating": 4.5
+    }
+
+@pytest.mark.asyncio
+async def test_sparse_post_is_read_without_caching(fake_db):
+    row = post_row()
+    result_mock = MagicMock()
+    result_mock.first.return_value = row
+    fake_db.execute = AsyncMock(return_value=result_mock)
+
+    service = PostService(PostRepository(fake_db))
+    post = await service.get_post_by_id(row.id, frozenset({"id", "tags"}))
+
+    assert [t.name for t in post.tags] == ["sea", "sun"]
+    assert post_cache.get(row.id) is None
+
+def test_sparse_read_has_an_etag_without_a_version_probe(client, fake_db):
+    row = post_row()
+    result_mock = MagicMock()
+    result_mock.first.return_value = row
+    fake_db.execute = AsyncMock(return_value=result_mock)
+
+    async def override():
+        yield fake_db
+
+    app.dependency_overrides[get_db] = override
+    try:
+        response = client.get(f"/posts/{row.id}?fields=id,title")
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] == make_etag(
+        row.updated_at, row.rating_count, row.user_updated_at, "id", "title"
+    )
+    fake_db.execute.assert_awaited_once()
+    sql = str(fake_db.execute.await_args.args[0])
+    assert "users.updated_at AS user_updated_at" in sql
+
+@pytest.mark.asyncio
+async def test_get_posts_by_ids_keeps_order_and_reports_missing(fake_db):
+    first, second = post_row(title="first"), post_row(title="second")
+    missing = uuid4()
+    result_mock = MagicMock()
+    result_mock.all.return_value = [second, first]
+    fake_db.execute = AsyncMock(return_value=result_mock)
+
+    service = PostService(PostRepository(fake_db))
+    batch = await service.get_posts_by_ids([first.id, missing, second.id, first.id])
+
+    assert [p.title for p in batch.items] == ["first", "second"]
+    assert batch.missing == [missing]
+    fake_db.execute.assert_awaited_once()
+
+@pytest.mark.asyncio
+async def test_get_posts_by_ids_only_queries_cache_misses(fake_db):
+    cached, fresh = post_row(title="cached"), post_row(title="fresh")
+    post_cache.set(cached.id, PostRepository._row_to_response(cached))
+    result_mock = MagicMock()
+    result_mock.all.return_value = [fresh]
+    fake_db.execute = AsyncMock(return_value=result_mock)
+
+    service = PostService(PostRepository(fake_db))
+    batch = await service.get_posts_by_ids([cached.id, fresh.id])
+
+    assert [p.title for p in batch.items] == ["cached", "fresh"]
+    stmt = fake_db.execute.await_args.args[0]
+    assert stmt.compile().params["post_ids"] == [fresh.id]
+
+def test_batch_request_is_bounded():
+    with pytest.raises(ValidationError):
+        PostBatchRequest(ids=[uuid4() for _ in range(MAX_BATCH_SIZE + 1)])
+    with pytest.raises(ValidationError):
+        PostBatchRequest(ids=[])
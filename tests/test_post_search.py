@@ -0,0 +1,253 @@
+import pytest
+from collections import namedtuple
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock
+from uuid import UUID, uuid4
+
+from fastapi import HTTPException
+from pydantic import ValidationError
+
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex
+
+from src.core.fieldsets import parse_fields
+from src.core.pagination import MAX_PAGE_SIZE, decode_cursor, encode_cursor
+from src.repositories.search_filter import (
+    SEARCH_COUNT_LIMIT, build_search_stmt, count_search_results, search_facets,
+    search_posts
+)
+from src.entity.models import Post, Tag, User
+from src.repositories.post_repository import PostRepository
+from src.schemas.search_filter import PostSearchRequest, SearchFacets
+from src.services.cache import search_cache
+from src.services.search_backend import search_backend
+from src.services.post_service import PostService
+from src.services.search_service import SearchService, search_cache_key
+
+
+def compile_stmt(filters):
+    return build_search_stmt(filters).compile(dialect=postgresql.dialect())
+
+
+def test_keyword_search_uses_full_text_index():
+    compiled = compile_stmt(PostSearchRequest(keyword="sunset, sea"))
+    sql = str(compiled)
+
+    assert "posts.search_vector @@ websearch_to_tsquery(" in sql
+    assert "sunset or sea" in compiled.params.values()
+    assert "ILIKE" not in sql
+    assert "GROUP BY" not in sql
+
+
+def test_blank_keyword_is_ignored():
+    assert search_backend.match(" , ") is None
+    assert "search_vector" not in str(compile_stmt(PostSearchRequest(keyword=" , ")))
+
+
+def test_relevance_sort_ranks_by_ts_rank():
+    sql = str(compile_stmt(PostSearchRequest(keyword="sunset", sort_by="relevance")))
+    assert "ORDER BY ts_rank(posts.search_vector, websearch_to_tsquery(" in sql
+
+    sql = str(compile_stmt(PostSearchRequest(sort_by="relevance")))
+    assert "ORDER BY posts.created_at DESC" in sql
+
+
+def test_tag_filter_does_not_fan_out_posts():
+    sql = str(compile_stmt(PostSearchRequest(tags="sea")))
+    assert "EXISTS (SELECT 1 \nFROM post_tags" in sql
+    assert "JOIN post_tags" not in sql
+
+
+def test_tag_fragment_is_matched_on_tags_table():
+    sql = str(compile_stmt(PostSearchRequest(tags="sea")))
+    assert "post_tags.tag_name IN (SELECT tags.name \nFROM tags \nWHERE tags.name ILIKE" in sql
+
+
+def test_substring_columns_have_trigram_indexes():
+    indexes = {index.name: index for model in (Post, Tag, User) for index in model.__table__.indexes}
+    ddl = str(CreateIndex(indexes["ix_users_email_trgm"]).compile(dialect=postgresql.dialect()))
+
+    assert ddl == "CREATE INDEX ix_users_email_trgm ON users USING gin (email gin_trgm_ops)"
+    assert {"ix_posts_title_trgm", "ix_posts_description_trgm", "ix_tags_name_trgm", "ix_users_name_trgm"} <= set(indexes)
+
+
+SearchRow = namedtuple("SearchRow", "post avg_rating rating_count sort_key")
+
+
+def make_posts(count):
+    author = User(id=uuid4(), name="Author", img_link=None)
+    return [
+        Post(
+            id=uuid4(), title=f"Post {i}", description="Text", image_url="http://img",
+            location=None, created_at=datetime(2025, 5, 1, 12, i), user=author, tags=[],
+        )
+        for i in range(count)
+    ]
+
+
+def fake_db(*results):
+    db = MagicMock()
+    db.execute = AsyncMock(side_effect=list(results))
+    return db
+
+
+def page_result(rows):
+    result = MagicMock()
+    result.unique.return_value.all.return_value = rows
+    return result
+
+
+@pytest.mark.asyncio
+async def test_search_reads_ratings_in_the_same_query():
+    posts = make_posts(3)
+    db = fake_db(page_result([
+        SearchRow(posts[0], 4.333, 3, posts[0].created_at),
+        SearchRow(posts[1], None, None, posts[1].created_at),
+        SearchRow(posts[2], 5.0, 1, posts[2].created_at),
+    ]))
+
+    page = await search_posts(PostSearchRequest(keyword="post"), db)
+
+    db.execute.assert_awaited_once()
+    sql = str(db.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+    assert "post_rating_stats.avg_rating AS avg_rating, post_rating_stats.rating_count AS rating_count" in sql
+    assert [(post.avg_rating, post.rating_count) for post in page.items] == [(4.3, 3), (0, 0), (5.0, 1)]
+    assert (page.total, page.total_is_estimate, page.next_cursor) == (3, False, None)
+
+
+@pytest.mark.asyncio
+async def test_search_pages_with_a_keyset_cursor_and_capped_count():
+    posts = make_posts(3)
+    db = fake_db(
+        page_result([SearchRow(post, None, None, post.created_at) for post in posts]),
+        MagicMock(scalar_one=MagicMock(return_value=42)),
+    )
+
+    page = await search_posts(PostSearchRequest(limit=2), db)
+
+    assert [post.id for post in page.items] == [posts[0].id, posts[1].id]
+    assert decode_cursor(page.next_cursor, datetime, UUID) == (posts[1].created_at, posts[1].id)
+    assert (page.total, page.total_is_estimate) == (42, False)
+
+    count_sql = str(db.execute.await_args_list[1].args[0].compile(dialect=postgresql.dialect()))
+    assert count_sql.startswith("SELECT count(*) AS count_1")
+    assert "LIMIT %(param_1)s" in count_sql
+
+    next_sql = str(build_search_stmt(
+        PostSearchRequest(limit=2, cursor=page.next_cursor)
+    ).compile(dialect=postgresql.dialect()))
+    assert "AND (posts.created_at, posts.id) < (" in next_sql
+
+
+@pytest.mark.asyncio
+async def test_search_total_falls_back_to_planner_estimate():
+    plan = [{"Plan": {"Node Type": "Seq Scan", "Plan Rows": 250000}}]
+    db = fake_db(
+        MagicMock(scalar_one=MagicMock(return_value=SEARCH_COUNT_LIMIT + 1)),
+        MagicMock(scalar_one=MagicMock(return_value=plan)),
+    )
+    db.get_bind.return_value.dialect.name = "postgresql"
+
+    assert await count_search_results(PostSearchRequest(keyword="sea"), db) == (250000, True)
+    explain_sql = str(db.execute.await_args_list[1].args[0].compile(dialect=postgresql.dialect()))
+    assert explain_sql.startswith("EXPLAIN (FORMAT JSON) SELECT")
+
+
+
+@pytest.mark.asyncio
+async def test_search_total_is_counted_exactly_without_postgres():
+    db = fake_db(
+        MagicMock(scalar_one=MagicMock(return_value=SEARCH_COUNT_LIMIT + 1)),
+        MagicMock(scalar_one=MagicMock(return_value=1500)),
+    )
+    db.get_bind.return_value.dialect.name = "sqlite"
+
+    assert await count_search_results(PostSearchRequest(keyword="sea"), db) == (1500, False)
+    count_sql = str(db.execute.await_args_list[1].args[0].compile(dialect=postgresql.dialect()))
+    assert count_sql.startswith("SELECT count(*) AS count_1")
+    assert "LIMIT" not in count_sql
+
+def test_search_limit_is_capped():
+    with pytest.raises(ValidationError):
+        PostSearchRequest(limit=MAX_PAGE_SIZE + 1)
+
+
+def test_search_rejects_a_cursor_from_another_sort():
+    cursor = encode_cursor(datetime(2025, 5, 1), uuid4())
+    with pytest.raises(HTTPException) as exc_info:
+        build_search_stmt(PostSearchRequest(sort_by="rating", cursor=cursor))
+    assert exc_info.value.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_search_facets_are_aggregated_in_one_statement():
+    FacetRow = namedtuple("FacetRow", "facet value count")
+    db = fake_db(MagicMock(all=MagicMock(return_value=[
+        FacetRow("tags", "sea", 7),
+        FacetRow("tags", "sunset", 3),
+        FacetRow("stars", None, 2),
+        FacetRow("stars", "5", 4),
+        FacetRow("stars", "4", 6),
+    ])))
+
+    facets = await search_facets(PostSearchRequest(keyword="sea"), db, frozenset({"tags", "stars"}))
+
+    db.execute.assert_awaited_once()
+    sql = str(db.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+    assert sql.startswith("WITH matched AS")
+    assert "UNION ALL" in sql
+    assert [(tag.name, tag.count) for tag in facets.tags] == [("sea", 7), ("sunset", 3)]
+    assert [(star.stars, star.count) for star in facets.stars] == [(5, 4), (4, 6), (None, 2)]
+
+
+def test_unknown_facets_are_rejected():
+    with pytest.raises(HTTPException) as exc_info:
+        parse_fields("tags,colours", SearchFacets, label="facets")
+    assert exc_info.value.detail == "Unknown facets: colours"
+
+
+def test_search_cache_key_is_canonical():
+    assert search_cache_key(PostSearchRequest(keyword="Sea, sunset")) == search_cache_key(
+        PostSearchRequest(keyword="sunset,sea , SEA")
+    )
+    assert search_cache_key(PostSearchRequest(from_date=datetime(2025, 5, 1, 8))) == search_cache_key(
+        PostSearchRequest(from_date=datetime(2025, 5, 1, 23, 30))
+    )
+    assert search_cache_key(PostSearchRequest(sort_by="relevance")) == search_cache_key(PostSearchRequest())
+    assert search_cache_key(PostSearchRequest(tags="sea")) != search_cache_key(PostSearchRequest(keyword="sea"))
+    assert search_cache_key(PostSearchRequest(), fields=frozenset({"id"})) != search_cache_key(PostSearchRequest())
+
+
+def test_tag_fragment_is_normalised_once_for_key_and_query():
+    padded, plain = PostSearchRequest(tags=" Sea "), PostSearchRequest(tags="Sea")
+
+    assert padded.tags == "Sea"
+    assert search_cache_key(padded) == search_cache_key(plain)
+    assert compile_stmt(padded).params == compile_stmt(plain).params
+
+    blank = PostSearchRequest(tags="  ")
+    assert blank.tags is None
+    assert search_cache_key(blank) == search_cache_key(PostSearchRequest())
+    assert "post_tags" not in str(compile_stmt(blank))
+
+
+@pytest.mark.asyncio
+async def test_repeated_search_is_served_from_cache_until_a_post_write():
+    posts = make_posts(1)
+    rows = [SearchRow(posts[0], 4.0, 1, posts[0].created_at)]
+    db = fake_db(page_result(rows), page_result(rows))
+    db.commit = AsyncMock()
+    service = SearchService(db)
+
+    first = await service.search_posts(PostSearchRequest(keyword="Sea"))
+    second = await service.search_posts(PostSearchRequest(keyword="sea"))
+
+    assert second is first
+    db.execute.assert_awaited_once()
+    assert search_cache.stats()["hits"] == 1
+
+    writer_db = MagicMock(execute=AsyncMock(return_value=MagicMock(rowcount=1)), commit=AsyncMock())
+    await PostService(PostRepository(writer_db, User(id=uuid4()))).delete_post(posts[0].id)
+    await service.search_posts(PostSearchRequest(keyword="sea"))
+
+    assert db.execute.await_count == 2
@@ -0,0 +1,154 @@
+import asyncio
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from src.repositories.rating_repository import apply_rating_deltas
+from src.services.rating_aggregator import RatingAggregator
+
+
+def recording_sessions():
+    db = MagicMock()
+    db.execute = AsyncMock()
+    db.commit = AsyncMock()
+
+    @asynccontextmanager
+    async def session():
+        yield db
+
+    return session, db
+
+
+@pytest.mark.asyncio
+async def test_flush_coalesces_ratings_per_post():
+    aggregator = RatingAggregator(flush_interval=60, max_events=100)
+    session, db = recording_sessions()
+    write = AsyncMock()
+    aggregator.start(session, write)
+    first, second = uuid4(), uuid4()
+
+    for rating in (5, 4, 3):
+        aggregator.add(first, rating)
+    aggregator.add(second, 1)
+    await aggregator.flush()
+
+    write.assert_awaited_once_with(db, {first: (0, 0, 1, 1, 1), second: (1, 0, 0, 0, 0)})
+    assert len(aggregator) == 0
+    await aggregator.stop()
+
+
+@pytest.mark.asyncio
+async def test_max_events_flushes_before_the_interval():
+    aggregator = RatingAggregator(flush_interval=60, max_events=3)
+    session, _ = recording_sessions()
+    write = AsyncMock()
+    aggregator.start(session, write)
+    post_id = uuid4()
+
+    for _ in range(3):
+        aggregator.add(post_id, 4)
+    await asyncio.sleep(0.01)
+
+    write.assert_awaited_once()
+    await aggregator.stop()
+
+
+@pytest.mark.asyncio
+async def test_stop_flushes_pending_deltas():
+    aggregator = RatingAggregator(flush_interval=60, max_events=100)
+    session, _ = recording_sessions()
+    write = AsyncMock()
+    aggregator.start(session, write)
+    post_id = uuid4()
+
+    aggregator.add(post_id, 2)
+    await aggregator.stop()
+
+    assert not aggregator.running
+    write.assert_awaited_once()
+    assert write.await_args.args[1] == {post_id: (0, 1, 0, 0, 0)}
+
+
+@pytest.mark.asyncio
+async def test_stop_during_a_slow_flush_writes_every_rating():
+    aggregator = RatingAggregator(flush_interval=0.05, max_events=100)
+    session, _ = recording_sessions()
+    written = []
+
+    async def slow_write(db, deltas):
+        await asyncio.sleep(0.2)
+        written.append(deltas)
+
+    aggregator.start(session, slow_write)
+    post_id = uuid4()
+
+    aggregator.add(post_id, 5)
+    await asyncio.sleep(0.1)  # the periodic flush is now inside slow_write
+    aggregator.add(post_id, 4)
+    await aggregator.stop()
+
+    assert written == [{post_id: (0, 0, 0, 0, 1)}, {post_id: (0, 0, 0, 1, 0)}]
+    assert len(aggregator) == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_flush_keeps_the_deltas():
+    aggregator = RatingAggregator(flush_interval=60, max_events=100)
+    session, _ = recording_sessions()
+    aggregator.start(session, AsyncMock(side_effect=asyncio.CancelledError))
+    post_id = uuid4()
+
+    aggregator.add(post_id, 2)
+    with pytest.raises(asyncio.CancelledError):
+        await aggregator.flush()
+
+    assert len(aggregator) == 1
+    aggregator._write = AsyncMock()
+    await aggregator.stop()
+    aggregator._write.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_keeps_the_deltas():
+    aggregator = RatingAggregator(flush_interval=60, max_events=100)
+    session, _ = recording_sessions()
+    write = AsyncMock(side_effect=[RuntimeError("database down"), None])
+    aggregator.start(session, write)
+    post_id = uuid4()
+
+    aggregator.add(post_id, 5)
+    with pytest.raises(RuntimeError):
+        await aggregator.flush()
+    aggregator.add(post_id, 3)
+    await aggregator.flush()
+
+    assert write.await_args.args[1] == {post_id: (0, 0, 1, 0, 1)}
+    await aggregator.stop()
+
+
+def test_zero_interval_disables_batching():
+    aggregator = RatingAggregator(flush_interval=0, max_events=100)
+    aggregator.start(MagicMock(), AsyncMock())
+    assert not aggregator.running
+
+
+@pytest.mark.asyncio
+async def test_apply_rating_deltas_writes_one_statement():
+    _, db = recording_sessions()
+    post_id = uuid4()
+    deltas = {post_id: (0, 0, 0, 1, 1)}
+
+    await apply_rating_deltas(db, deltas)
+
+    db.execute.assert_awaited_once()
+    sql = str(db.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+    assert "FROM (VALUES " in sql
+    assert "rating_count = (post_rating_stats.rating_count + excluded.rating_count)" in sql
+    assert "star_5_count = (post_rating_stats.star_5_count + excluded.star_5_count)" in sql
+    assert "UPDATE posts SET star_bucket=" in sql
+    params = db.execute.await_args.args[0].compile(dialect=postgresql.dialect()).params
+    assert [params[f"param_{i}"] for i in range(1, 9)] == [post_id, 9, 2, 0, 0, 0, 1, 1]
+    db.commit.assert_awaited_once()
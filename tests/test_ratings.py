@@ -1,8 +1,12 @@
 import pytest
+from sqlalchemy.dialects import postgresql
 from unittest.mock import AsyncMock, MagicMock
 from uuid import uuid4
-from src.entity.models import User, Post, PostRating
-from src.repositories.rating_repository import add_rating, get_rating_data
+from src.entity.models import User, PostRating
+from main import app
+from src.database.db import get_db
+from src.repositories.rating_repository import add_rating, get_rating_data, get_rating_histogram
+from src.services.rating_aggregator import RatingAggregator
 from fastapi import HTTPException
 
 
@@ -10,48 +14,120 @@ from fastapi import HTTPException
 async def test_add_rating_success():
     post_id = uuid4()
     user_id = uuid4()
-
-    mock_post = Post(id=post_id, user_id=uuid4())
     mock_user = User(id=user_id)
 
-    mock_scalars_post = MagicMock()
-    mock_scalars_post.first.return_value = mock_post
-
-    mock_scalars_rating = MagicMock()
-    mock_scalars_rating.first.return_value = None
-
-    mock_result_post = MagicMock()
-    mock_result_post.scalars.return_value = mock_scalars_post
-
-    mock_result_rating = MagicMock()
-    mock_result_rating.scalars.return_value = mock_scalars_rating
+    mock_write = MagicMock()
+    mock_write.first.return_value = (post_id,)
 
     mock_session = AsyncMock()
-    mock_session.execute.side_effect = [mock_result_post, mock_result_rating]
+    mock_session.execute.return_value = mock_write
     mock_session.commit = AsyncMock()
-    mock_session.refresh = AsyncMock()
 
     result = await add_rating(post_id, 5, mock_session, mock_user)
     assert isinstance(result, PostRating)
     assert result.rating == 5
+    assert (result.post_id, result.user_id) == (post_id, user_id)
+
+    # One round trip: the rating insert, stats upsert and star bucket update.
+    mock_session.execute.assert_awaited_once()
+    sql = str(mock_session.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+    assert sql.startswith("WITH inserted AS \n(INSERT INTO post_ratings")
+    assert "posts.user_id != " in sql
+    assert "ON CONFLICT (post_id, user_id) DO NOTHING" in sql
+    assert "stats AS \n(INSERT INTO post_rating_stats" in sql
+    assert "CASE WHEN (inserted.rating = %(rating_1)s::INTEGER) THEN %(param_2)s::INTEGER" in sql
+    assert "UPDATE posts SET star_bucket=CAST(floor(stats.avg_rating) AS SMALLINT)" in sql
+    # The post row is only touched when its bucket changes, and the returned
+    # row (a rating was written) comes from the stats CTE, not that update.
+    assert "posts.star_bucket IS DISTINCT FROM CAST(floor(stats.avg_rating) AS SMALLINT)" in sql
+    assert sql.endswith("SELECT stats.post_id \nFROM stats")
+    mock_session.commit.assert_awaited_once()
 
 
 @pytest.mark.asyncio
-async def test_get_rating_data():
+async def test_add_rating_buffers_stats_while_the_aggregator_runs(monkeypatch):
+    post_id = uuid4()
+    mock_user = User(id=uuid4())
+    aggregator = MagicMock(running=True)
+    monkeypatch.setattr("src.repositories.rating_repository.rating_aggregator", aggregator)
+
+    mock_write = MagicMock()
+    mock_write.first.return_value = (post_id, 3)
+
+    mock_session = AsyncMock()
+    mock_session.execute.return_value = mock_write
+
+    await add_rating(post_id, 3, mock_session, mock_user)
+
+    sql = str(mock_session.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+    assert sql.startswith("INSERT INTO post_ratings")
+    assert "post_rating_stats" not in sql
+    aggregator.add.assert_called_once_with(post_id, 3)
+
+
+@pytest.mark.asyncio
+async def test_add_rating_writes_stats_itself_when_the_aggregator_stops_meanwhile(monkeypatch):
     post_id = uuid4()
-    mock_post = Post(id=post_id)
+    mock_user = User(id=uuid4())
+    aggregator = RatingAggregator(flush_interval=60, max_events=100)
+    aggregator.start(MagicMock(), AsyncMock())
+    monkeypatch.setattr("src.repositories.rating_repository.rating_aggregator", aggregator)
+
+    mock_write = MagicMock()
+    mock_write.first.return_value = (post_id, 4)
+
+    mock_session = AsyncMock()
+    mock_session.execute.return_value = mock_write
+
+    async def commit_during_shutdown():
+        # Shutdown's final flush runs while this request awaits its commit.
+        await aggregator.stop()
+
+    mock_session.commit.side_effect = commit_during_shutdown
+
+    await add_rating(post_id, 4, mock_session, mock_user)
 
-    mock_scalars_post = MagicMock()
-    mock_scalars_post.first.return_value = mock_post
+    assert len(aggregator) == 0
+    statements = [call.args[0] for call in mock_session.execute.await_args_list]
+    assert str(statements[0].compile(dialect=postgresql.dialect())).startswith("INSERT INTO post_ratings")
+    stats_sql = str(statements[1].compile(dialect=postgresql.dialect()))
+    assert "FROM (VALUES " in stats_sql
+    assert "INSERT INTO post_rating_stats" in stats_sql
 
-    mock_result_post = MagicMock()
-    mock_result_post.scalars.return_value = mock_scalars_post
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "owner, status_code",
+    [(None, 404), ("caller", 403), ("someone else", 400)],
+)
+async def test_add_rating_maps_an_empty_write_to_the_reason(owner, status_code):
+    post_id = uuid4()
+    mock_user = User(id=uuid4())
+
+    mock_write = MagicMock()
+    mock_write.first.return_value = None
+    mock_owner = MagicMock()
+    owner_id = {"caller": mock_user.id, "someone else": uuid4()}.get(owner)
+    mock_owner.first.return_value = None if owner is None else MagicMock(user_id=owner_id)
+
+    mock_session = AsyncMock()
+    mock_session.execute.side_effect = [mock_write, mock_owner]
+
+    with pytest.raises(HTTPException) as exc_info:
+        await add_rating(post_id, 4, mock_session, mock_user)
+    assert exc_info.value.status_code == status_code
+    mock_session.commit.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_get_rating_data():
+    post_id = uuid4()
 
     mock_result_rating_data = MagicMock()
-    mock_result_rating_data.first.return_value = (4.5, 10)
+    mock_result_rating_data.first.return_value = (post_id, 4.5, 10)
 
     mock_session = AsyncMock()
-    mock_session.execute.side_effect = [mock_result_post, mock_result_rating_data]
+    mock_session.execute.return_value = mock_result_rating_data
 
     avg, count = await get_rating_data(post_id, mock_session)
     assert avg == 4.5
@@ -61,20 +137,81 @@ async def test_get_rating_data():
 @pytest.mark.asyncio
 async def test_get_rating_data_no_ratings():
     post_id = uuid4()
-    mock_post = Post(id=post_id)
-
-    mock_scalars_post = MagicMock()
-    mock_scalars_post.first.return_value = mock_post
-
-    mock_result_post = MagicMock()
-    mock_result_post.scalars.return_value = mock_scalars_post
 
     mock_result_rating_data = MagicMock()
-    mock_result_rating_data.first.return_value = (None, 0)
+    mock_result_rating_data.first.return_value = (post_id, None, None)
 
     mock_session = AsyncMock()
-    mock_session.execute.side_effect = [mock_result_post, mock_result_rating_data]
+    mock_session.execute.return_value = mock_result_rating_data
 
     avg, count = await get_rating_data(post_id, mock_session)
     assert avg == 0
-    assert count == 0
\ No newline at end of file
+    assert count == 0
+
+
+@pytest.mark.asyncio
+async def test_get_rating_data_post_not_found():
+    mock_result = MagicMock()
+    mock_result.first.return_value = None
+
+    mock_session = AsyncMock()
+    mock_session.execute.return_value = mock_result
+
+    with pytest.raises(HTTPException) as exc_info:
+        await get_rating_data(uuid4(), mock_session)
+    assert exc_info.value.status_code == 404
+    mock_session.execute.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_get_rating_histogram_reads_the_stats_row():
+    mock_result = MagicMock()
+    mock_result.first.return_value = (uuid4(), 1, 0, 2, 7, 12)
+
+    mock_session = AsyncMock()
+    mock_session.execute.return_value = mock_result
+
+    assert await get_rating_histogram(uuid4(), mock_session) == [1, 0, 2, 7, 12]
+    mock_session.execute.assert_awaited_once()
+    sql = str(mock_session.execute.await_args.args[0])
+    assert "post_ratings" not in sql
+
+
+@pytest.mark.asyncio
+async def test_get_rating_histogram_without_ratings():
+    mock_result = MagicMock()
+    mock_result.first.return_value = (uuid4(), None, None, None, None, None)
+
+    mock_session = AsyncMock()
+    mock_session.execute.return_value = mock_result
+
+    assert await get_rating_histogram(uuid4(), mock_session) == [0, 0, 0, 0, 0]
+
+
+def test_histogram_route(client):
+    mock_result = MagicMock()
+    mock_result.first.return_value = (uuid4(), 1, 0, 2, 7, 12)
+    db = MagicMock()
+    db.execute = AsyncMock(return_value=mock_result)
+
+    async def override():
+        yield db
+
+    app.dependency_overrides[get_db] = override
+    try:
+        response = client.get(f"/ratings/posts/{uuid4()}/histogram")
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "total_reviews": 22,
+        "counts": [
+            {"stars": 1, "count": 1},
+            {"stars": 2, "count": 0},
+            {"stars": 3, "count": 2},
+            {"stars": 4, "count": 7},
+            {"stars": 5, "count": 12},
+        ],
+    }
+    assert response.headers["ETag"]
@@ -0,0 +1,164 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.entity.models import Base, User, UserTypeEnum
+from src.repositories import post_repository, search_filter
+from src.repositories.post_repository import PostRepository
+from src.repositories.search_filter import build_search_stmt, search_posts
+from src.schemas.post import PostCreateModel
+from src.schemas.search_filter import PostSearchRequest
+from src.services.bm25_index import BM25Index
+from src.services.search_backend import MemorySearchBackend, PostgresSearchBackend, SearchBackend
+
+
+@pytest.fixture
+def memory_backend(monkeypatch):
+    backend = MemorySearchBackend(max_hits=100)
+    monkeypatch.setattr(search_filter, "search_backend", backend)
+    monkeypatch.setattr(post_repository, "search_backend", backend)
+    return backend
+
+
+def test_bm25_ranks_rarer_and_denser_matches_first():
+    index = BM25Index()
+    index.add("beach", "Sunset on the beach sunset sea")
+    index.add("city", "City lights at night")
+    index.add("lake", "Quiet lake at sunset")
+    index.add("sea", "Sea and sky")
+
+    ranked = [doc_id for doc_id, _ in index.search(["sunset"], limit=10)]
+    assert ranked == ["beach", "lake"]
+
+    either = {doc_id for doc_id, _ in index.search(["night", "sky"], limit=10)}
+    assert either == {"city", "sea"}
+    assert index.search(["sunset"], limit=1)[0][0] == "beach"
+
+
+def test_bm25_updates_and_removals_survive_compaction():
+    index = BM25Index()
+    for i in range(4):
+        index.add(i, f"post number {i} about mountains")
+
+    index.add(0, "now about the sea")
+    index.remove(1)
+    index.remove(2)
+    index.remove(3)
+
+    assert len(index) == 1
+    assert index.search(["mountains"], limit=10) == []
+    assert [doc_id for doc_id, _ in index.search(["sea"], limit=10)] == [0]
+
+    index.add(5, "mountains again")
+    assert [doc_id for doc_id, _ in index.search(["mountains"], limit=10)] == [5]
+
+
+def test_memory_backend_turns_hits_into_id_condition_and_rank(memory_backend):
+    post_id = uuid4()
+    memory_backend.load([(post_id, "Sunset", "over the sea", "nature")])
+
+    sql = str(build_search_stmt(
+        PostSearchRequest(keyword="Nature", sort_by="relevance")
+    ).compile(dialect=postgresql.dialect()))
+
+    assert "posts.id IN (__[POSTCOMPILE_search_ids])" in sql
+    assert "ORDER BY CASE posts.id WHEN" in sql
+    assert "search_vector" not in sql
+
+    no_hits = str(build_search_stmt(PostSearchRequest(keyword="city")).compile(dialect=postgresql.dialect()))
+    assert "false" in no_hits
+
+
+def test_memory_backend_condition_covers_matches_beyond_max_hits(memory_backend):
+    post_ids = [uuid4() for _ in range(150)]
+    memory_backend.load([(post_id, "Sunset", "over the sea", "") for post_id in post_ids])
+
+    match = memory_backend.match("sunset")
+    params = match.condition.compile(dialect=postgresql.dialect()).params
+
+    # Date sorts, paging and the total see every match; only the ranking is capped.
+    assert sorted(params["search_ids"]) == sorted(post_ids)
+    assert len(match.rank.whens) == memory_backend.max_hits
+
+
+def test_memory_backend_words_of_one_keyword_must_all_match(memory_backend):
+    both, sea_only, night = uuid4(), uuid4(), uuid4()
+    memory_backend.load([
+        (both, "Sea and city", "", ""),
+        (sea_only, "Sea", "", ""),
+        (night, "Night", "", ""),
+    ])
+
+    def matched(keyword):
+        match = memory_backend.match(keyword)
+        return set(match.condition.compile(dialect=postgresql.dialect()).params["search_ids"])
+
+    assert matched("sea city") == {both}
+    assert matched("sea city, night") == {both, night}
+    assert matched("sea, city") == {both, sea_only}
+
+
+def test_postgres_backend_uses_full_text_search():
+    match = PostgresSearchBackend().match("sea, sky")
+    assert "@@ websearch_to_tsquery(" in str(match.condition.compile(dialect=postgresql.dialect()))
+    assert PostgresSearchBackend().match("") is None
+
+
+
+def test_backends_must_implement_match():
+    class Incomplete(SearchBackend):
+        name = "incomplete"
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+@pytest.mark.asyncio
+async def test_post_writes_update_the_memory_index(memory_backend):
+    db = MagicMock(execute=AsyncMock(return_value=MagicMock(rowcount=1)), commit=AsyncMock())
+    repo = PostRepository(db, User(id=uuid4()))
+
+    created = await repo.create(PostCreateModel(
+        title="Alpine lake", description="Morning hike", image_url="img", location=None,
+        tags=[{"name": "mountains"}],
+    ))
+    assert [doc_id for doc_id, _ in memory_backend.index.search(["mountains"], 10)] == [created.id]
+
+    await repo.delete_post(created.id)
+    assert memory_backend.index.search(["mountains"], 10) == []
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_searches_a_sqlite_database(memory_backend):
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with async_sessionmaker(engine, expire_on_commit=False)() as db:
+        author = User(
+            id=uuid4(), username="ann", email="ann@example.com", type=UserTypeEnum.user, password="x"
+        )
+        db.add(author)
+        await db.commit()
+
+        beach, lake, _ = await PostRepository(db, author).create_many([
+            PostCreateModel(title="Sunset beach", description="sunset sunset", image_url="a",
+                            location=None, tags=[{"name": "sea"}]),
+            PostCreateModel(title="Lake at sunset", description="", image_url="b",
+                            location=None, tags=[{"name": "sea"}, {"name": "lake"}]),
+            PostCreateModel(title="City lights", description="", image_url="c",
+                            location=None, tags=[]),
+        ])
+
+        page = await search_posts(
+            PostSearchRequest(keyword="sunset", sort_by="relevance", limit=1), db, facets=frozenset({"tags"})
+        )
+
+    await engine.dispose()
+
+    assert [post.id for post in page.items] == [beach.id]
+    assert page.next_cursor is not None
+    assert page.total == 2
+    assert {(tag.name, tag.count) for tag in page.facets.tags} == {("sea", 2), ("lake", 1)}
@@ -0,0 +1,56 @@
+from datetime import datetime
+
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from src.entity.models import Post, User
+from src.repositories.search_compiler import compile_user_filters, star_range, timestamp_range
+from src.repositories.search_filter import build_search_stmt
+from src.schemas.admin_search import UserSearchRequest
+from src.schemas.search_filter import PostSearchRequest
+
+
+def compile_where(*clauses):
+    compiled = select(Post.id).where(*clauses).compile(dialect=postgresql.dialect())
+    return str(compiled).split("WHERE ", 1)[1], compiled.params
+
+
+def test_single_day_becomes_a_half_open_range():
+    sql, params = compile_where(*timestamp_range(Post.created_at, datetime(2025, 5, 1, 15, 30), None))
+
+    # Only the parameters carry a type; the column itself stays bare.
+    assert sql == (
+        "posts.created_at >= %(created_at_1)s::TIMESTAMP WITHOUT TIME ZONE "
+        "AND posts.created_at < %(created_at_2)s::TIMESTAMP WITHOUT TIME ZONE"
+    )
+    assert params == {"created_at_1": datetime(2025, 5, 1), "created_at_2": datetime(2025, 5, 2)}
+
+
+def test_two_bounds_end_before_the_day_after_to_date():
+    sql, params = compile_where(
+        *timestamp_range(Post.created_at, datetime(2025, 5, 1), datetime(2025, 5, 3))
+    )
+
+    assert "BETWEEN" not in sql
+    assert params == {"created_at_1": datetime(2025, 5, 1), "created_at_2": datetime(2025, 5, 4)}
+
+
+def test_star_filter_uses_the_precomputed_bucket():
+    sql, params = compile_where(*star_range(4.7))
+
+    assert sql == "posts.star_bucket = %(star_bucket_1)s::SMALLINT"
+    assert params == {"star_bucket_1": 4}
+
+
+def test_search_statements_never_cast_indexed_columns():
+    post_sql = str(build_search_stmt(
+        PostSearchRequest(from_date=datetime(2025, 5, 1), exact_star=3)
+    ).compile(dialect=postgresql.dialect()))
+    user_sql = str(select(User).where(*compile_user_filters(
+        UserSearchRequest(reg_date_to=datetime(2025, 5, 1))
+    )).compile(dialect=postgresql.dialect()))
+
+    assert "CAST" not in post_sql
+    assert "CAST" not in user_sql
+    assert "posts.star_bucket = " in post_sql
+    assert "users.created_at >= " in user_sql
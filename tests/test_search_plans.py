@@ -0,0 +1,251 @@
+"""EXPLAIN checks for every search filter combination against a real PostgreSQL.
+
+The tables are created in a throwaway schema inside a transaction that is
+rolled back, seeded and analysed, and sequential scans are priced out
+(``enable_seqscan = off``) so a plan only contains a Seq Scan when no index
+can serve the query at all.
+
+This is an opt-in integration suite (the ``postgres`` marker): it runs only
+with ``pytest --run-postgres``, and then DB_URL must point at a reachable
+PostgreSQL server where the pg_trgm extension can be created. An unreachable
+server fails the tests instead of skipping them.
+"""
+import itertools
+from datetime import datetime
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.conf.config import settings
+from src.database.explain import Explain, plan_of
+from src.entity.models import Base
+from src.repositories.admin_search_repository import build_user_search_stmt
+from src.repositories.search_filter import build_search_stmt
+from src.schemas.admin_search import UserSearchRequest
+from src.schemas.search_filter import PostSearchRequest
+
+PLAN_SCHEMA = "search_plan_check"
+
+SEED = (
+    """
+    INSERT INTO users (id, username, name, email, type, password, is_active, created_at, updated_at)
+    SELECT gen_random_uuid(), 'user' || i, 'Name ' || i, 'user' || i || '@example.com',
+           (CASE i % 20 WHEN 0 THEN 'admin' WHEN 1 THEN 'moderator' ELSE 'user' END)::usertypeenum, 'x',
+           i % 10 <> 0, timestamp '2025-01-01' + i * interval '1 hour', now()
+    FROM generate_series(1, 2000) AS i
+    """,
+    """
+    INSERT INTO posts (id, user_id, title, description, image_url, tag_names, created_at, updated_at)
+    SELECT gen_random_uuid(), u.id,
+           'Post about ' || (ARRAY['sea', 'city', 'forest', 'night'])[1 + (u.n + s) % 4],
+           'Description ' || u.n || '-' || s, 'http://img/' || u.n || '-' || s,
+           'tag' || ((u.n + s) % 50),
+           timestamp '2025-01-01' + (u.n * 5 + s) * interval '10 minutes', now()
+    FROM (SELECT id, row_number() OVER (ORDER BY id) AS n FROM users) AS u
+    CROSS JOIN generate_series(1, 5) AS s
+    """,
+    "INSERT INTO tags (name) SELECT 'tag' || i FROM generate_series(0, 49) AS i",
+    "INSERT INTO post_tags (id, post_id, tag_name) SELECT gen_random_uuid(), id, tag_names FROM posts",
+    """
+    INSERT INTO post_rating_stats (post_id, rating_sum, rating_count, avg_rating)
+    SELECT id, 4, 1, 1 + (abs(hashtext(id::text)) % 400) / 100.0 FROM posts
+    """,
+    """
+    UPDATE posts SET star_bucket = floor(stats.avg_rating)::smallint
+    FROM post_rating_stats AS stats WHERE stats.post_id = posts.id
+    """,
+)
+
+pytestmark = pytest.mark.postgres
+
+DATE_BOUNDS = {
+    "no dates": (None, None),
+    "from only": (datetime(2025, 1, 20, 13), None),
+    "to only": (None, datetime(2025, 1, 20, 9)),
+    "both": (datetime(2025, 1, 10), datetime(2025, 1, 12)),
+}
+
+
+@pytest_asyncio.fixture
+async def plan_conn():
+    engine = create_async_engine(settings.DB_URL)
+    try:
+        conn = await engine.connect()
+    except (OSError, DBAPIError) as e:
+        await engine.dispose()
+        pytest.fail(f"PostgreSQL is not reachable at DB_URL: {e}")
+
+    transaction = await conn.begin()
+    try:
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        await conn.execute(text(f"CREATE SCHEMA {PLAN_SCHEMA}"))
+        await conn.execute(text(f"SET LOCAL search_path TO {PLAN_SCHEMA}, public"))
+        # checkfirst would find the application's own tables through public.
+        await conn.run_sync(lambda sync_conn: Base.metadata.create_all(sync_conn, checkfirst=False))
+        for statement in SEED:
+            await conn.execute(text(statement))
+        await conn.execute(text("ANALYZE users, posts, tags, post_tags, post_rating_stats"))
+        await conn.execute(text("SET LOCAL enable_seqscan = off"))
+        yield conn
+    finally:
+        await transaction.rollback()
+        await conn.close()
+        await engine.dispose()
+
+
+def plan_nodes(plan):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+def access_paths(plan) -> dict:
+    """How each table is read (relation -> sorted scan node types), for failure messages."""
+    paths = {}
+    for node in plan_nodes(plan):
+        relation = node.get("Relation Name")
+        if relation:
+            paths.setdefault(relation, set()).add(node["Node Type"])
+    return {relation: sorted(types) for relation, types in paths.items()}
+
+
+def index_conds(plan, index_name) -> list[str]:
+    return [
+        node.get("Index Cond", "")
+        for node in plan_nodes(plan)
+        if node.get("Index Name") == index_name
+    ]
+
+
+def uses_index_cond(plan, index_name, fragment) -> bool:
+    return any(fragment in cond for cond in index_conds(plan, index_name))
+
+
+async def explain(conn, stmt) -> dict:
+    return plan_of((await conn.execute(Explain(stmt))).scalar_one())
+
+
+# With sequential scans priced out any index at all beats a Seq Scan, so
+# "no Seq Scan" alone proves little: each filter must show up as an Index
+# Cond of the index meant to serve it. These checks run on the statements
+# without ORDER BY/LIMIT, which is also how the count and facet queries use
+# them; with a LIMIT the planner may rightly prefer walking the sort index.
+POST_FILTER_INDEXES = {
+    "keyword": ("ix_posts_search_vector", "search_vector @@"),
+    "tags": ("ix_tags_name_trgm", "~~*"),
+    "dates": ("ix_posts_created_at_id", "created_at >="),
+    "exact_star": ("ix_posts_star_bucket_created_at_id", "star_bucket = "),
+}
+
+USER_FILTER_INDEXES = {
+    "search": (("ix_users_name_trgm", "~~*"), ("ix_users_email_trgm", "~~*")),
+    "role": (("ix_users_type_is_active_created_at", "type = "),),
+    "dates": (
+        ("ix_users_created_at", "created_at >="),
+        ("ix_users_type_is_active_created_at", "created_at >="),
+    ),
+}
+
+
+def post_filters(keyword=None, tags=None, dates="no dates", exact_star=None) -> PostSearchRequest:
+    from_date, to_date = DATE_BOUNDS[dates]
+    return PostSearchRequest(
+        keyword=keyword, tags=tags, from_date=from_date, to_date=to_date, exact_star=exact_star
+    )
+
+
+def user_filters(search=None, role=None, dates="no dates") -> UserSearchRequest:
+    reg_date_from, reg_date_to = DATE_BOUNDS[dates]
+    return UserSearchRequest(
+        search=search, role=role, reg_date_from=reg_date_from, reg_date_to=reg_date_to
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("name, filters", [
+    ("keyword", post_filters(keyword="sea")),
+    ("tags", post_filters(tags="tag1")),
+    ("dates", post_filters(dates="both")),
+    ("dates", post_filters(dates="from only")),
+    ("exact_star", post_filters(exact_star=4)),
+])
+async def test_each_post_filter_is_an_index_condition(plan_conn, name, filters):
+    plan = await explain(plan_conn, build_search_stmt(filters).order_by(None))
+    index_name, fragment = POST_FILTER_INDEXES[name]
+
+    assert uses_index_cond(plan, index_name, fragment), f"{name}: {access_paths(plan)}"
+    if name == "dates":
+        assert any("created_at <" in cond for cond in index_conds(plan, index_name))
+
+
+@pytest.mark.asyncio
+async def test_every_post_search_combination_uses_indexes(plan_conn):
+    for keyword, tags, dates, exact_star in itertools.product(
+        (None, "sea"), (None, "tag1"), DATE_BOUNDS, (None, 4)
+    ):
+        filters = post_filters(keyword, tags, dates, exact_star)
+        plan = await explain(plan_conn, build_search_stmt(filters).limit(21))
+        paths = access_paths(plan)
+        combination = f"keyword={keyword} tags={tags} {dates} exact_star={exact_star}: {paths}"
+
+        assert not any("Seq Scan" in types for types in paths.values()), combination
+
+        plan = await explain(plan_conn, build_search_stmt(filters).order_by(None))
+
+        # At least one of the active filters narrows the scan through its index.
+        active = [
+            name for name, value in
+            (("keyword", keyword), ("tags", tags), ("dates", dates != "no dates"), ("exact_star", exact_star))
+            if value
+        ]
+        if active:
+            assert any(
+                uses_index_cond(plan, *POST_FILTER_INDEXES[name]) for name in active
+            ), combination
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("name, filters", [
+    ("search", user_filters(search="user12")),
+    ("role", user_filters(role="moderator")),
+    ("dates", user_filters(dates="both")),
+])
+async def test_each_user_filter_is_an_index_condition(plan_conn, name, filters):
+    plan = await explain(plan_conn, build_user_search_stmt(filters).order_by(None))
+
+    assert any(
+        uses_index_cond(plan, index_name, fragment)
+        for index_name, fragment in USER_FILTER_INDEXES[name]
+    ), f"{name}: {access_paths(plan)}"
+
+
+@pytest.mark.asyncio
+async def test_every_user_search_combination_uses_indexes(plan_conn):
+    for search, role, dates, include_inactive in itertools.product(
+        (None, "user12"), (None, "moderator"), DATE_BOUNDS, (False, True)
+    ):
+        stmt = build_user_search_stmt(
+            user_filters(search, role, dates), include_inactive=include_inactive
+        )
+        plan = await explain(plan_conn, stmt.limit(21))
+        paths = access_paths(plan)
+        combination = f"search={search} role={role} {dates} include_inactive={include_inactive}: {paths}"
+
+        assert "Seq Scan" not in paths.get("users", []), combination
+
+        plan = await explain(plan_conn, stmt.order_by(None))
+
+        active = [
+            name for name, value in
+            (("search", search), ("role", role), ("dates", dates != "no dates"))
+            if value
+        ]
+        if active:
+            assert any(
+                uses_index_cond(plan, index_name, fragment)
+                for name in active
+                for index_name, fragment in USER_FILTER_INDEXES[name]
+            ), combination
@@ -0,0 +1,73 @@
+import contextlib
+import json
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from starlette.requests import Request
+
+from src.core.streaming import NDJSON_MEDIA_TYPE, ndjson_response, wants_ndjson
+from src.repositories.post_repository import PostRepository
+from src.schemas.post import TagsShortResponse
+from tests.test_post_routes import post_row
+
+
+class AsyncRows:
+    def __init__(self, rows):
+        self._rows = iter(rows)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._rows)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+def make_request(accept=None):
+    headers = [(b"accept", accept.encode())] if accept else []
+    return Request({"type": "http", "headers": headers})
+
+
+def test_wants_ndjson():
+    assert wants_ndjson(make_request(NDJSON_MEDIA_TYPE))
+    assert wants_ndjson(make_request("application/json"), stream=True)
+    assert not wants_ndjson(make_request("application/json"))
+    assert not wants_ndjson(make_request())
+
+
+@pytest.mark.asyncio
+async def test_stream_posts_yields_rows_as_they_arrive():
+    rows = [post_row(title="first"), post_row(title="second", tag_names=None)]
+    db = MagicMock()
+    db.stream = AsyncMock(return_value=AsyncRows(rows))
+
+    posts = [post async for post in PostRepository(db).stream_posts()]
+
+    assert [p.title for p in posts] == ["first", "second"]
+    assert posts[0].tags == [TagsShortResponse(name="sea"), TagsShortResponse(name="sun")]
+    stmt = db.stream.await_args.args[0]
+    assert stmt.get_execution_options()["yield_per"] > 0
+
+
+@pytest.mark.asyncio
+async def test_ndjson_response_writes_one_document_per_line():
+    session = MagicMock()
+
+    @contextlib.asynccontextmanager
+    async def fake_session():
+        yield session
+
+    async def produce(db):
+        assert db is session
+        for row in [post_row(title="a"), post_row(title="b")]:
+            yield PostRepository._row_to_response(row)
+
+    with patch("src.core.streaming.sessionmanager") as manager:
+        manager.session = fake_session
+        response = ndjson_response(produce)
+        chunks = [chunk async for chunk in response.body_iterator]
+
+    assert response.media_type == NDJSON_MEDIA_TYPE
+    assert [json.loads(chunk)["title"] for chunk in chunks] == ["a", "b"]
+    assert all(chunk.endswith("\n") for chunk in chunks)
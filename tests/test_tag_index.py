@@ -0,0 +1,36 @@
+from fastapi.testclient import TestClient
+
+from main import app
+from src.services.tag_index import TagPrefixIndex, tag_index
+
+
+def test_suggest_ranks_prefix_matches_by_post_count():
+    index = TagPrefixIndex()
+    index.load([("Sunset", 4), ("sun", 9), ("summer", 2), ("sea", 7), ("Sunrise", 4)])
+
+    assert index.suggest("su") == [("sun", 9), ("Sunrise", 4), ("Sunset", 4), ("summer", 2)]
+    assert index.suggest("SUN", limit=2) == [("sun", 9), ("Sunrise", 4)]
+    assert index.suggest("x") == []
+
+
+def test_add_updates_counts_and_memoised_answers():
+    index = TagPrefixIndex()
+    index.load([("sea", 1), ("sand", 2)])
+    assert index.suggest("s") == [("sand", 2), ("sea", 1)]
+
+    index.add(["sea", "sea", "sky"])
+
+    assert index.suggest("s") == [("sea", 3), ("sand", 2), ("sky", 1)]
+    assert len(index) == 3
+
+
+def test_suggest_route_reads_the_index():
+    tag_index.load([("nature", 5), ("night", 8), ("city", 3)])
+
+    response = TestClient(app).get("/tags/suggest", params={"prefix": "n"})
+
+    assert response.status_code == 200
+    assert response.json() == [
+        {"name": "night", "post_count": 8},
+        {"name": "nature", "post_count": 5},
+    ]
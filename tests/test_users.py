@@ -1,7 +1,9 @@
 import pytest
+from fastapi import HTTPException
 from unittest.mock import AsyncMock, MagicMock
-from uuid import uuid4
+from uuid import UUID, uuid4
 from datetime import datetime, timezone
+from src.core.pagination import decode_cursor
 from src.entity.models import User
 from src.repositories.admin_search_repository import get_user_by_id, search_users
 from src.schemas.admin_search import UserSearchRequest
@@ -50,27 +52,27 @@ async def test_get_user_by_id_not_found():
     assert result is None
 
 
-@pytest.mark.asyncio
-async def test_search_users_basic():
-    mock_user = User(
-        id=uuid4(),
-        username="testuser",
-        email="test@example.com",
-        name="Test User",
-        type="user",
-        is_active=True,
-        created_at=datetime.now(timezone.utc),
-        updated_at=datetime.now(timezone.utc)
-    )
+def _user_row(name):
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    return {
+        "id": uuid4(), "name": name, "username": name.lower(), "email": f"{name.lower()}@example.com",
+        "type": "user", "img_link": None, "phone": None, "birthdate": None, "description": None,
+        "is_active": True, "created_at": now, "updated_at": now, "sort_key": name,
+    }
 
-    mock_scalars = MagicMock()
-    mock_scalars.all.return_value = [mock_user]
-
-    mock_result = MagicMock()
-    mock_result.scalars.return_value = mock_scalars
 
+def _session_returning(rows):
     mock_session = AsyncMock()
-    mock_session.execute.return_value = mock_result
+    mock_session.execute.return_value = MagicMock(
+        mappings=MagicMock(return_value=MagicMock(all=MagicMock(return_value=rows)))
+    )
+    return mock_session
+
+
+@pytest.mark.asyncio
+async def test_search_users_basic():
+    row = _user_row("Test")
+    mock_session = _session_returning([row])
 
     filters = UserSearchRequest(search="test")
 
@@ -79,5 +81,39 @@ async def test_search_users_basic():
         filters=filters,
         current_user_is_admin=True
     )
+    assert [user.id for user in result.items] == [row["id"]]
+    assert result.next_cursor is None
+
+    sql = str(mock_session.execute.await_args.args[0])
+    assert "users.password" not in sql
+    assert "LIMIT" in sql
+
 
-    assert result == [mock_user]
\ No newline at end of file
+@pytest.mark.asyncio
+async def test_search_users_pages_by_cursor():
+    rows = [_user_row(name) for name in ("Ann", "Bob", "Cid")]
+    mock_session = _session_returning(rows)
+
+    page = await search_users(db=mock_session, filters=UserSearchRequest(limit=2))
+
+    assert [user.name for user in page.items] == ["Ann", "Bob"]
+    assert decode_cursor(page.next_cursor, str, str, UUID) == ("name:asc", "Bob", rows[1]["id"])
+
+    mock_session = _session_returning([])
+    await search_users(db=mock_session, filters=UserSearchRequest(limit=2, cursor=page.next_cursor))
+    sql = str(mock_session.execute.await_args.args[0])
+    assert "(coalesce(users.name, ''), users.id) > " in sql
+
+
+@pytest.mark.asyncio
+async def test_search_users_rejects_a_cursor_from_another_sort():
+    rows = [_user_row(name) for name in ("Ann", "Bob", "Cid")]
+    page = await search_users(db=_session_returning(rows), filters=UserSearchRequest(limit=2))
+
+    for other_sort in (
+        UserSearchRequest(sort_by="registration_date", cursor=page.next_cursor),
+        UserSearchRequest(sort_order="desc", cursor=page.next_cursor),
+    ):
+        with pytest.raises(HTTPException) as exc_info:
+            await search_users(db=_session_returning([]), filters=other_sort)
+        assert exc_info.value.status_code == 400